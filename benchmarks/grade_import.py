@@ -0,0 +1,50 @@
+# the per-row work of MoodleGradesActionExecutor and the moodle id lookups of the other importers
+# run from the repository root: python -m benchmarks.grade_import [student count ...]
+# check out the parent commit and run it again to compare
+
+import sys
+import time
+
+from vgrabber.model import Student, Test, HomeWork
+from .synthetic import make_subject
+
+
+def main(student_counts):
+    for student_count in student_counts:
+        subject = make_subject(0)
+
+        for i in range(student_count):
+            student = Student(subject, str(i), 'Name{0}'.format(i), 'Surname{0}'.format(i), None)
+            subject.add_student(student)
+            student.moodle_email = 'u{0}@stud.uniza.sk'.format(i)
+            student.moodle_id = 7000 + i
+
+        grade_items = [subject.get_test_by_id(test.id) for test in subject.tests]
+        for category in subject.home_work_categories:
+            grade_items.extend(subject.get_home_work_by_id(home_work.id) for home_work in category.home_works)
+
+        # moodle exports the students in a different order than they were imported in
+        rows = ['u{0}@stud.uniza.sk'.format(i) for i in reversed(range(student_count))]
+
+        start = time.perf_counter()
+        for student_email in rows:
+            student = subject.get_student_by_email(student_email)
+            for grade_item in grade_items:
+                if isinstance(grade_item, Test):
+                    student.add_test_points(grade_item, 5.0)
+                if isinstance(grade_item, HomeWork):
+                    student.add_home_work_points(grade_item, 5.0)
+        import_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(student_count):
+            subject.get_student_by_moodle_id(7000 + i)
+        lookup_time = time.perf_counter() - start
+
+        print('students {0:5}: grade import {1:.3f} s, moodle id lookups {2:.3f} s'.format(
+            student_count, import_time, lookup_time
+        ))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [500, 1000, 2000])
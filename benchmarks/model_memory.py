@@ -0,0 +1,55 @@
+# retained and peak memory of loading a large subject from its xml
+# run from the repository root: python -m benchmarks.model_memory [student count]
+# check out the parent commit and run it again to compare
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from vgrabber.datalayer import DataLayer
+from vgrabber.datalayer.fileaccessors import DirectoryFileAccessor
+from .synthetic import make_subject
+
+
+def main(student_count):
+    with tempfile.TemporaryDirectory() as path:
+        data_layer = DataLayer()
+        data_layer.save_as(DirectoryFileAccessor(path), make_subject(student_count))
+        data_layer.close()
+
+        # the snapshot would skip the xml deserializer, which is the part being measured
+        for name in os.listdir(path):
+            if name.endswith('.snapshot'):
+                os.remove(os.path.join(path, name))
+
+        gc.collect()
+        tracemalloc.start()
+
+        start = time.perf_counter()
+        data_layer = DataLayer()
+        subject = data_layer.load(DirectoryFileAccessor(path))
+        load_time = time.perf_counter() - start
+
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        records = [
+            record
+                for student in subject.students
+                for record in list(student.grades) + list(student.home_work_points) + list(student.test_points)
+        ]
+        file_count = sum(len(record.files.files) for record in records)
+
+        print('students {0}, records {1}, files {2}: retained {3:.1f} MB, peak {4:.1f} MB, load {5:.2f} s'.format(
+            len(subject.students), len(records), file_count, current / 2**20, peak / 2**20, load_time
+        ))
+
+        data_layer.close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
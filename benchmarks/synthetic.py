@@ -0,0 +1,80 @@
+import datetime
+import random
+
+from vgrabber.model import Subject, FinalExam, Test, HomeWorkCategory, HomeWork, Teacher, Group, Student, \
+    StudentGrade, Grade
+from vgrabber.model.files import StoredFile
+
+
+def make_subject(student_count, home_work_count=20, test_count=8, final_exam_count=3, seed=1):
+    # a subject shaped like an imported course, the same seed always gives the same one
+    rnd = random.Random(seed)
+
+    subject = Subject('5BI101', 'Informatika', '2020/2021')
+
+    final_exams = []
+    for i in range(final_exam_count):
+        final_exam = FinalExam(subject, datetime.datetime(2021, 1, 10 + i, 9, 0), 'RA{0}'.format(i), 1000 + i)
+        final_exam.moodle_id = 500 + i
+        subject.add_final_exam(final_exam)
+        final_exams.append(final_exam)
+
+    tests = []
+    for i in range(test_count):
+        test = Test(subject, 200 + i, 'Test {0}'.format(i), 200 + i)
+        subject.add_test(test)
+        tests.append(test)
+
+    home_works = []
+    for c in range(2):
+        category = HomeWorkCategory(subject, 'category{0}'.format(c))
+        category.max_points = 10.0
+        subject.add_home_work_category(category)
+        for i in range(home_work_count // 2):
+            home_work = HomeWork(subject, 300 + c * 100 + i, 'Home work {0}-{1}'.format(c, i), 300 + c * 100 + i)
+            category.add_home_work(home_work)
+            home_works.append(home_work)
+
+    groups = []
+    for t in range(3):
+        teacher = Teacher(subject, 'Name{0}'.format(t), 'Surname{0}'.format(t), 90 + t, 't{0}@uniza.sk'.format(t))
+        for g in range(2):
+            group = Group(subject, str(t * 2 + g), 70 + t * 2 + g, 'group{0}'.format(t * 2 + g))
+            teacher.add_taught_group(group)
+            groups.append(group)
+        subject.add_teacher(teacher)
+
+    for i in range(student_count):
+        student = Student(subject, str(10000 + i), 'Name{0}'.format(i), 'Surname{0}'.format(i), '5ZI0{0}'.format(i % 3))
+        student.moodle_id = 5000 + i
+        student.moodle_group_id = groups[i % len(groups)].moodle_id
+        student.moodle_email = 's{0}@stud.uniza.sk'.format(i)
+
+        for home_work in home_works:
+            r = rnd.random()
+            if r < 0.5:
+                student.add_home_work_points(home_work, float(rnd.randint(0, 8)))
+            if r < 0.3 or r > 0.9:
+                student.add_home_work_file(home_work, StoredFile(
+                    'submission{0}.zip'.format(i), 'objects/{0}/hw/{1}.zip'.format(i, home_work.id)
+                ))
+
+        for test in tests:
+            r = rnd.random()
+            if r < 0.7:
+                student.add_test_points(test, float(rnd.randint(0, 20)) + 0.5)
+            if r < 0.4 or r > 0.95:
+                student.add_test_file(test, StoredFile(
+                    'test.html', 'objects/{0}/test/{1}.html'.format(i, test.id)
+                ))
+
+        for final_exam in final_exams:
+            r = rnd.random()
+            if r < 0.2:
+                student.add_grade(StudentGrade(subject, student, final_exam, list(Grade)[i % len(Grade)]))
+            if 0.1 < r < 0.3:
+                student.add_final_exam_points(final_exam, 33.0)
+
+        subject.add_student(student)
+
+    return subject
@@ -1 +1,2 @@
 from .datalayer import DataLayer
+from .converter import convert
@@ -0,0 +1,163 @@
+import errno
+import hashlib
+import os
+import os.path
+import stat
+from shutil import copyfileobj
+from typing import Callable, BinaryIO, Optional, Collection, List
+
+from vgrabber.model.files import StoredFile
+from vgrabber.utilities.filecopy import copy_file
+from vgrabber.utilities.filename import correct_file_name
+from .fileaccessors import FileAccessor
+
+
+class ContentStore:
+    file_accessor: FileAccessor
+
+    OBJECTS_FOLDER = 'objects'
+
+    __CHUNK_SIZE = 1024 * 1024
+
+    # the mode a newly created file gets, os.umask can only be read by setting it, so it is read once
+    __UMASK = os.umask(0)
+    os.umask(__UMASK)
+    __FILE_MODE = 0o666 & ~__UMASK
+
+    def __init__(self, file_accessor):
+        self.file_accessor = file_accessor
+        self.__existing_folders = set()
+        self.__folder_devices = {}
+        self.__unlinkable_devices = set()
+
+    def store_file(self, file_name: str, open_source: Callable[[], BinaryIO],
+                   file_hash: Optional[str] = None) -> StoredFile:
+        if file_hash is None:
+            with open_source() as source:
+                file_hash = self.__hash_file(source)
+
+        folder, object_name = self.__get_object_location(file_name, file_hash)
+
+        return self.__store_object(file_name, folder, object_name, open_source, file_hash)
+
+    def store_local_file(self, file_name: str, source_path: str, file_hash: Optional[str] = None) -> StoredFile:
+        # a known hash means the source never changes, it is an object of another content store or a spooled download
+        allow_link = file_hash is not None
+
+        if file_hash is None:
+            with open(source_path, 'rb') as source:
+                file_hash = self.__hash_file(source)
+
+        folder, object_name = self.__get_object_location(file_name, file_hash)
+        target_path = folder.get_file_system_path(object_name)
+
+        if target_path is None:
+            return self.__store_object(file_name, folder, object_name, lambda: open(source_path, 'rb'), file_hash)
+
+        self.__ensure_folder_exists(folder)
+
+        if not allow_link or not self.__link(source_path, target_path):
+            self.__write_exclusively(target_path, lambda f: copy_file(source_path, f))
+
+        return StoredFile(file_name, folder.get_relative_path(object_name), file_hash)
+
+    def find_unreferenced_objects(self, referenced_paths: Collection[str]) -> List[str]:
+        objects = self.file_accessor.open_folder(self.OBJECTS_FOLDER)
+        return [
+            path
+                for path in map(objects.get_relative_path, objects.list_files())
+                    if path not in referenced_paths
+        ]
+
+    def __store_object(self, file_name, folder, object_name, open_source, file_hash):
+        if folder.get_file_stats(object_name) is None:
+            def write(f):
+                with open_source() as source:
+                    copyfileobj(source, f)
+
+            self.__write_object(folder, object_name, write)
+
+        return StoredFile(file_name, folder.get_relative_path(object_name), file_hash)
+
+    def __write_object(self, folder, object_name, write):
+        self.__ensure_folder_exists(folder)
+
+        target_path = folder.get_file_system_path(object_name)
+
+        if target_path is None:
+            with folder.open_file(object_name, 'w') as f:
+                write(f)
+        else:
+            self.__write_exclusively(target_path, write)
+
+    def __ensure_folder_exists(self, folder):
+        folder_path = folder.get_relative_path()
+        if folder_path not in self.__existing_folders:
+            folder.ensure_exists()
+            self.__existing_folders.add(folder_path)
+
+    def __link(self, source_path, target_path):
+        target_device = self.__get_folder_device(os.path.dirname(target_path))
+        if target_device in self.__unlinkable_devices:
+            return False
+
+        try:
+            source_stats = os.stat(source_path)
+            # links cannot cross file systems, a spooled download is often on another one than the store
+            if source_stats.st_dev != target_device:
+                return False
+
+            # spooled downloads are created private, the linked object gets the mode of any other saved file
+            if stat.S_IMODE(source_stats.st_mode) != self.__FILE_MODE:
+                os.chmod(source_path, self.__FILE_MODE)
+        except OSError:
+            return False
+
+        try:
+            os.link(source_path, target_path)
+        except FileExistsError:
+            # saved by another thread in the meantime, the content is the same
+            pass
+        except OSError as e:
+            if e.errno in (errno.EPERM, errno.EOPNOTSUPP):
+                # the target file system cannot link at all, do not ask it again for every file
+                self.__unlinkable_devices.add(target_device)
+            return False
+        return True
+
+    def __get_folder_device(self, folder_path):
+        device = self.__folder_devices.get(folder_path)
+        if device is None:
+            device = os.stat(folder_path).st_dev
+            self.__folder_devices[folder_path] = device
+        return device
+
+    def __write_exclusively(self, target_path, write):
+        # objects can be saved from several threads at once, only the first one writes the content
+        try:
+            f = open(target_path, 'xb')
+        except FileExistsError:
+            return
+
+        try:
+            with f:
+                write(f)
+        except BaseException:
+            os.remove(target_path)
+            raise
+
+    def __get_object_location(self, file_name, file_hash):
+        # the extension is kept so that external applications recognize the extracted file
+        extension = os.path.splitext(correct_file_name(file_name))[1].lower()
+
+        folder = self.file_accessor.open_folder(self.OBJECTS_FOLDER, file_hash[:2])
+
+        return folder, file_hash + extension
+
+    def __hash_file(self, file):
+        file_hash = hashlib.sha256()
+
+        for chunk in iter(lambda: file.read(self.__CHUNK_SIZE), b''):
+            file_hash.update(chunk)
+
+        return file_hash.hexdigest()
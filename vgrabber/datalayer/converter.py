@@ -0,0 +1,10 @@
+from .datalayer import DataLayer
+from .fileaccessors import FileAccessor
+
+
+def convert(source: FileAccessor, target: FileAccessor):
+    data_layer = DataLayer()
+
+    subject = data_layer.load(source)
+    data_layer.save_as(target, subject)
+    data_layer.close()
@@ -1,12 +1,17 @@
-from typing import Optional
-
-from lxml.etree import parse, xmlfile
+import logging
+from contextlib import nullcontext
+from itertools import chain
+from typing import Optional, Callable
 
 from vgrabber.datalayer.filesaver import FileSaver
 from vgrabber.model import Subject
-from .deserializer import SubjectDeserializer
-from .fileaccessors import FileAccessor
+from vgrabber.model.files import StoredFile
+from .contentstore import ContentStore
+from .deserializer import StreamingSubjectDeserializer
+from .fileaccessors import FileAccessor, SqliteFileAccessor
 from .serializer import SubjectSerializer
+from .snapshot import SubjectSnapshot, HashingWriter
+from .sqlitestore import SqliteSubjectStore
 
 
 class DataLayer:
@@ -14,52 +19,140 @@ class DataLayer:
 
     SUBJECT_INFO_NAME = 'subjectinfo.xml'
 
+    # part of the storage that can be taken by superseded data before a save compacts it
+    COMPACTION_THRESHOLD = 0.5
+
     def __init__(self):
         self.file_accessor = None
+        self.__subject_store = None
 
     def load(self, file_accessor: FileAccessor) -> Subject:
         if self.file_accessor is not None:
             self.file_accessor.close()
 
-        self.file_accessor = file_accessor
-        with self.file_accessor.open_file(self.SUBJECT_INFO_NAME, 'r') as xf:
-            return SubjectDeserializer(parse(xf).getroot()).deserialize()
+        self.__open(file_accessor)
+
+        subject = self.__load()
+        subject.accept_changes()
+
+        return subject
 
     @property
     def can_save(self):
         return self.file_accessor is not None
 
     def save(self, subject: Subject):
-        FileSaver(None, self.file_accessor).save_subject_files(subject)
+        if not subject.has_changes:
+            return
+
+        with self.__transaction():
+            if subject.has_structure_changes:
+                FileSaver(None, self.file_accessor).save_subject_files(subject)
+            else:
+                FileSaver(None, self.file_accessor).save_subject_files(subject, subject.changed_students)
 
-        self.__save(subject)
+            self.__save(subject, incremental=True)
 
-    def save_as(self, file_accessor: FileAccessor, subject: Subject):
+        # only a committed save makes the subject unchanged
+        subject.accept_changes()
+
+        self.__compact_if_wasteful(subject)
+
+    def save_as(self, file_accessor: FileAccessor, subject: Subject,
+                progress: Optional[Callable[[int, int], None]] = None):
         old_file_accessor = self.file_accessor
+        self.__open(file_accessor)
+
+        with self.__transaction():
+            FileSaver(old_file_accessor, self.file_accessor, progress).save_subject_files(subject)
+
+            if old_file_accessor is not None:
+                old_file_accessor.close()
+
+            self.__save(subject)
+
+        subject.accept_changes()
+
+        self.__compact_if_wasteful(subject)
+
+    def __open(self, file_accessor: FileAccessor):
         self.file_accessor = file_accessor
 
-        FileSaver(old_file_accessor, self.file_accessor).save_subject_files(subject)
+        if isinstance(file_accessor, SqliteFileAccessor):
+            self.__subject_store = SqliteSubjectStore(file_accessor.connection)
+        else:
+            self.__subject_store = None
+
+    def __transaction(self):
+        if self.__subject_store is None:
+            return nullcontext()
 
-        if old_file_accessor is not None:
-            old_file_accessor.close()
+        return self.__subject_store.transaction()
 
-        self.__save(subject)
+    def __load(self):
+        if self.__subject_store is not None:
+            return self.__subject_store.load()
 
-    def __save(self, subject: Subject):
-        root_element = SubjectSerializer(subject).serialize()
+        subject = SubjectSnapshot(self.file_accessor, self.SUBJECT_INFO_NAME).load()
+        if subject is not None:
+            return subject
 
+        with self.file_accessor.open_file(self.SUBJECT_INFO_NAME, 'r') as xf:
+            return StreamingSubjectDeserializer(xf).deserialize()
+
+    def __save(self, subject: Subject, incremental=False):
+        if self.__subject_store is not None:
+            if incremental:
+                self.__subject_store.save_changes(subject)
+            else:
+                self.__subject_store.save(subject)
+        else:
+            self.__save_xml(subject)
+
+    def __save_xml(self, subject: Subject):
         with self.file_accessor.open_file(self.SUBJECT_INFO_NAME, 'w') as f:
-            with xmlfile(f, encoding='utf-8') as xf:
-                xf.write_declaration()
-                xf.write(
-                    root_element,
-                    pretty_print=True
-                )
+            hashing_file = HashingWriter(f)
+            SubjectSerializer(subject).write(hashing_file)
+
+        subject.accept_changes()
+
+        SubjectSnapshot(self.file_accessor, self.SUBJECT_INFO_NAME).save(subject, hashing_file.hexdigest())
+
+    def __compact_if_wasteful(self, subject: Subject):
+        storage_stats = self.file_accessor.get_storage_stats()
+        if storage_stats is None:
+            return
+
+        size, wasted_size = storage_stats
+        if size and wasted_size / size > self.COMPACTION_THRESHOLD:
+            reclaimed = self.compact(subject)
+            logging.info("Compacted the subject storage, %d bytes reclaimed", reclaimed)
+
+    def compact(self, subject: Optional[Subject] = None) -> int:
+        removed_files = ()
+
+        # unsaved edits may have dropped files the stored subject still refers to
+        if subject is not None and not subject.has_changes:
+            removed_files = ContentStore(self.file_accessor).find_unreferenced_objects(
+                self.__get_stored_file_paths(subject)
+            )
+
+        return self.file_accessor.compact(removed_files)
+
+    def __get_stored_file_paths(self, subject: Subject):
+        return {
+            file.file_path
+                for student in subject.students
+                    for record in chain(student.grades, student.home_work_points, student.test_points)
+                        for file in record.files
+                            if isinstance(file, StoredFile)
+        }
 
-    def open_file_for_external_app(self, rel_path: str) -> str:
-        return self.file_accessor.open_file_for_external_app(rel_path)
+    def open_file_for_external_app(self, rel_path: str, file_name: Optional[str] = None) -> str:
+        return self.file_accessor.open_file_for_external_app(rel_path, file_name)
 
     def close(self):
         if self.file_accessor is not None:
             self.file_accessor.close()
             self.file_accessor = None
+            self.__subject_store = None
@@ -1 +1,2 @@
 from .subject import SubjectDeserializer
+from .streaming import StreamingSubjectDeserializer
@@ -0,0 +1,38 @@
+from typing import Dict
+
+from vgrabber.model import Subject, Test, HomeWork, FinalExam
+
+
+class DeserializationContext:
+    subject: Subject
+    tests: Dict[int, Test]
+    home_works: Dict[int, HomeWork]
+    final_exams: Dict[int, FinalExam]
+
+    def __init__(self, subject):
+        self.subject = subject
+        self.tests = {}
+        self.home_works = {}
+        self.final_exams = {}
+
+    def add_final_exam(self, final_exam):
+        self.subject.add_final_exam(final_exam)
+        self.final_exams[final_exam.id] = final_exam
+
+    def add_test(self, test):
+        self.subject.add_test(test)
+        self.tests[test.id] = test
+
+    def add_home_work_category(self, home_work_category):
+        self.subject.add_home_work_category(home_work_category)
+        for home_work in home_work_category.home_works:
+            self.home_works[home_work.id] = home_work
+
+    def get_final_exam(self, final_exam_id):
+        return self.final_exams[final_exam_id]
+
+    def get_test(self, test_id):
+        return self.tests[test_id]
+
+    def get_home_work(self, home_work_id):
+        return self.home_works[home_work_id]
@@ -4,8 +4,8 @@ from vgrabber.model import FinalExam
 
 
 class FinalExamDeserializer:
-    def __init__(self, subject, finalexam_element):
-        self.__subject = subject
+    def __init__(self, context, finalexam_element):
+        self.__context = context
         self.__finalexam_element = finalexam_element
 
     def deserialize(self):
@@ -18,9 +18,9 @@ class FinalExamDeserializer:
 
         room = self.__finalexam_element.attrib['room']
 
-        final_exam = FinalExam(self.__subject, date_time, room, id)
+        final_exam = FinalExam(self.__context.subject, date_time, room, id)
 
         if 'moodleid' in self.__finalexam_element.attrib:
-            final_exam.moodle_id = self.__finalexam_element.attrib['moodleid']
+            final_exam.moodle_id = int(self.__finalexam_element.attrib['moodleid'])
 
         return final_exam
@@ -0,0 +1,12 @@
+class GradingPolicyDeserializer:
+    def __init__(self, context, grading_element):
+        self.__context = context
+        self.__grading_element = grading_element
+
+    def deserialize(self):
+        grading_policy = self.__context.subject.grading_policy
+
+        if 'minpoints' in self.__grading_element.attrib:
+            grading_policy.minimum_points = float(self.__grading_element.attrib['minpoints'])
+
+        return grading_policy
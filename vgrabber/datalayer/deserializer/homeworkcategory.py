@@ -2,13 +2,13 @@ from vgrabber.model import HomeWorkCategory, HomeWork
 
 
 class HomeWorkCategoryDeserializer:
-    def __init__(self, subject, category_element):
-        self.__subject = subject
+    def __init__(self, context, category_element):
+        self.__context = context
         self.__category_element = category_element
 
     def deserialize(self):
         home_work_category = HomeWorkCategory(
-            self.__subject,
+            self.__context.subject,
             self.__category_element.attrib['name']
         )
         
@@ -17,7 +17,7 @@ class HomeWorkCategoryDeserializer:
 
         for homework_element in self.__category_element.xpath('./homework'):
             homework = HomeWork(
-                self.__subject,
+                self.__context.subject,
                 int(homework_element.attrib['id']),
                 homework_element.attrib['name'],
                 int(homework_element.attrib['moodleid'])
@@ -2,28 +2,76 @@ from vgrabber.base.importaction import ImportAction
 
 
 class ProgressChecker:
-    __progress_xpaths = (
-        (ImportAction.student_list, '//students/student'),
-        (ImportAction.final_exam_list, '//finalexams/finalexam'),
-        (ImportAction.grades, '//student/finalexam[@grade]'),
-        (ImportAction.moodle_student_list, '//students/student[@moodleid]'),
-        (ImportAction.moodle_teacher_list, '//teachers/teacher'),
-        (ImportAction.moodle_final_exam_list, '//finalexams/finalexam[@moodleid]'),
-        (ImportAction.moodle_test_list, '//tests/test'),
-        (ImportAction.moodle_home_work_list, '//homeworks/category/homework'),
-        (ImportAction.moodle_final_exam_grades, '//student/finalexam[@points]'),
-        (ImportAction.moodle_home_work_grades, '//student/homework[@points]'),
-        (ImportAction.moodle_test_grades, '//student/test[@points]'),
-        (ImportAction.moodle_final_exam_details, '//student/finalexam/file'),
-        (ImportAction.moodle_home_work_details, '//student/homework/file'),
-        (ImportAction.moodle_test_details, '//student/test/file'),
-        (ImportAction.moodle_teacher_groups, '//teacher/group'),
-    )
-
-    def __init__(self, subject_element):
+    def __init__(self, subject_element=None):
         self.__subject_element = subject_element
+        self.__progress = set()
+        self.__persisted = False
+
+    def check_element(self, element):
+        if not self.__persisted:
+            self.__progress.update(self.__find_out_actions(element))
+
+    def use_progress_element(self, progress_element):
+        self.__progress = {
+            ImportAction[action_element.attrib['name']]
+                for action_element in progress_element.iterchildren('action')
+                    if action_element.attrib['name'] in ImportAction.__members__
+        }
+        self.__persisted = True
 
     def find_out_progress(self):
-        for action, xpath in self.__progress_xpaths:
-            if any(True for i in self.__subject_element.xpath(xpath)):
-                yield action
+        if self.__subject_element is not None:
+            progress_element = self.__subject_element.find('progress')
+            if progress_element is not None:
+                self.use_progress_element(progress_element)
+            else:
+                for element in self.__subject_element.iter():
+                    self.check_element(element)
+            self.__subject_element = None
+
+        return frozenset(self.__progress)
+
+    def __find_out_actions(self, element):
+        parent = element.getparent()
+        if parent is None:
+            return
+
+        if parent.tag == 'students' and element.tag == 'student':
+            yield ImportAction.student_list
+            if 'moodleid' in element.attrib:
+                yield ImportAction.moodle_student_list
+        elif parent.tag == 'finalexams' and element.tag == 'finalexam':
+            yield ImportAction.final_exam_list
+            if 'moodleid' in element.attrib:
+                yield ImportAction.moodle_final_exam_list
+        elif parent.tag == 'teachers' and element.tag == 'teacher':
+            yield ImportAction.moodle_teacher_list
+        elif parent.tag == 'teacher' and element.tag == 'group':
+            yield ImportAction.moodle_teacher_groups
+        elif parent.tag == 'tests' and element.tag == 'test':
+            yield ImportAction.moodle_test_list
+        elif parent.tag == 'category' and element.tag == 'homework':
+            grand_parent = parent.getparent()
+            if grand_parent is not None and grand_parent.tag == 'homeworks':
+                yield ImportAction.moodle_home_work_list
+        elif parent.tag == 'student':
+            if element.tag == 'finalexam':
+                if 'grade' in element.attrib:
+                    yield ImportAction.grades
+                if 'points' in element.attrib:
+                    yield ImportAction.moodle_final_exam_grades
+            elif element.tag == 'homework':
+                if 'points' in element.attrib:
+                    yield ImportAction.moodle_home_work_grades
+            elif element.tag == 'test':
+                if 'points' in element.attrib:
+                    yield ImportAction.moodle_test_grades
+        elif element.tag == 'file':
+            grand_parent = parent.getparent()
+            if grand_parent is not None and grand_parent.tag == 'student':
+                if parent.tag == 'finalexam':
+                    yield ImportAction.moodle_final_exam_details
+                elif parent.tag == 'homework':
+                    yield ImportAction.moodle_home_work_details
+                elif parent.tag == 'test':
+                    yield ImportAction.moodle_test_details
@@ -0,0 +1,72 @@
+from lxml.etree import iterparse
+
+from vgrabber.model import Subject
+from .context import DeserializationContext
+from .finalexam import FinalExamDeserializer
+from .grading import GradingPolicyDeserializer
+from .homeworkcategory import HomeWorkCategoryDeserializer
+from .progresschecker import ProgressChecker
+from .student import StudentDeserializer
+from .teacher import TeacherDeserializer
+from .test import TestDeserializer
+
+
+class StreamingSubjectDeserializer:
+    def __init__(self, file):
+        self.__file = file
+
+    def deserialize(self):
+        context = None
+        progress_checker = ProgressChecker()
+        pending_students = []
+
+        for event, element in iterparse(self.__file, events=('start', 'end')):
+            if event == 'start':
+                if element.getparent() is None:
+                    context = DeserializationContext(Subject(
+                        element.attrib['number'],
+                        element.attrib['name'],
+                        element.attrib['year']
+                    ))
+                continue
+
+            progress_checker.check_element(element)
+
+            parent = element.getparent()
+            if parent is None:
+                continue
+
+            if parent.getparent() is None and element.tag == 'progress':
+                progress_checker.use_progress_element(element)
+            elif parent.getparent() is None and element.tag == 'grading':
+                GradingPolicyDeserializer(context, element).deserialize()
+            elif parent.tag == 'finalexams' and element.tag == 'finalexam':
+                context.add_final_exam(FinalExamDeserializer(context, element).deserialize())
+            elif parent.tag == 'tests' and element.tag == 'test':
+                context.add_test(TestDeserializer(context, element).deserialize())
+            elif parent.tag == 'homeworks' and element.tag == 'category':
+                context.add_home_work_category(HomeWorkCategoryDeserializer(context, element).deserialize())
+            elif parent.tag == 'teachers' and element.tag == 'teacher':
+                context.subject.add_teacher(TeacherDeserializer(context, element).deserialize())
+            elif parent.tag == 'students' and element.tag == 'student':
+                student_deserializer = StudentDeserializer(context, element)
+                student = student_deserializer.deserialize_student()
+                context.subject.add_student(student)
+                pending_students.append((student, student_deserializer.read_items()))
+            else:
+                continue
+
+            # the whole section item is in the model now, drop it and everything before it
+            element.clear()
+            while element.getprevious() is not None:
+                del parent[0]
+
+        for action in progress_checker.find_out_progress():
+            context.subject.finish_action(action)
+
+        # students are stored before the items they reference, so ids are resolved at the end
+        items_deserializer = StudentDeserializer(context, None)
+        for student, items in pending_students:
+            items_deserializer.deserialize_items(student, items)
+
+        return context.subject
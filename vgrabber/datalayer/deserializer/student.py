@@ -1,18 +1,26 @@
+from collections import namedtuple
+
 from vgrabber.model import Student, StudentGrade, Grade
 from vgrabber.model.files import StoredFile
 
+StudentItem = namedtuple('StudentItem', ['tag', 'id', 'points', 'grade', 'files'])
+
 
 class StudentDeserializer:
-    def __init__(self, subject, tests, home_works, final_exams, student_element):
-        self.__subject = subject
-        self.__tests = {test.id: test for test in tests}
-        self.__home_works = {home_work.id: home_work for home_work in home_works}
-        self.__final_exams = {final_exam.id: final_exam for final_exam in final_exams}
+    def __init__(self, context, student_element):
+        self.__context = context
         self.__student_element = student_element
 
     def deserialize(self):
+        student = self.deserialize_student()
+
+        self.deserialize_items(student, self.read_items())
+
+        return student
+
+    def deserialize_student(self):
         student = Student(
-            self.__subject,
+            self.__context.subject,
             self.__student_element.attrib.get('number'),
             self.__student_element.attrib['name'],
             self.__student_element.attrib['surname'],
@@ -26,49 +34,70 @@ class StudentDeserializer:
         if 'moodleemail' in self.__student_element.attrib:
             student.moodle_email = self.__student_element.attrib['moodleemail']
 
-        for test_element in self.__student_element.xpath('.//test'):
-            test = self.__tests[int(test_element.attrib['id'])]
+        return student
 
-            if 'points' in test_element.attrib:
-                student.add_test_points(test, float(test_element.attrib['points']))
+    def read_items(self):
+        # ids are resolved later by deserialize_items, so the element can be dropped in between
+        ret = []
 
-            for file in self.__deserialize_files(test_element):
-                student.add_test_file(test, file)
+        for tag in ('test', 'homework', 'finalexam'):
+            for item_element in self.__student_element.xpath('.//' + tag):
+                points = None
+                if 'points' in item_element.attrib:
+                    points = float(item_element.attrib['points'])
 
-        for homework_element in self.__student_element.xpath('.//homework'):
-            home_work = self.__home_works[int(homework_element.attrib['id'])]
+                ret.append(StudentItem(
+                    tag,
+                    int(item_element.attrib['id']),
+                    points,
+                    item_element.attrib.get('grade'),
+                    list(self.__deserialize_files(item_element))
+                ))
 
-            if 'points' in homework_element.attrib:
-                student.add_home_work_points(home_work, float(homework_element.attrib['points']))
+        return ret
 
-            for file in self.__deserialize_files(homework_element):
-                student.add_home_work_file(home_work, file)
+    def deserialize_items(self, student, items):
+        for item in items:
+            if item.tag == 'test':
+                test = self.__context.get_test(item.id)
 
-        for finalexam_element in self.__student_element.xpath('.//finalexam'):
-            grade_mark = None
-            if 'grade' in finalexam_element.attrib:
-                grade_mark = Grade[finalexam_element.attrib['grade']]
+                if item.points is not None:
+                    student.add_test_points(test, item.points)
 
-            grade = StudentGrade(
-                self.__subject,
-                student,
-                self.__final_exams[int(finalexam_element.attrib['id'])],
-                grade_mark
-            )
+                for file in item.files:
+                    student.add_test_file(test, file)
+            elif item.tag == 'homework':
+                home_work = self.__context.get_home_work(item.id)
 
-            if 'points' in finalexam_element.attrib:
-                grade.points = float(finalexam_element.attrib['points'])
+                if item.points is not None:
+                    student.add_home_work_points(home_work, item.points)
 
-            for file in self.__deserialize_files(finalexam_element):
-                grade.files.add_file(file)
+                for file in item.files:
+                    student.add_home_work_file(home_work, file)
+            elif item.tag == 'finalexam':
+                grade_mark = None
+                if item.grade is not None:
+                    grade_mark = Grade[item.grade]
 
-            student.add_grade(grade)
+                grade = StudentGrade(
+                    self.__context.subject,
+                    student,
+                    self.__context.get_final_exam(item.id),
+                    grade_mark
+                )
 
-        return student
+                if item.points is not None:
+                    grade.points = item.points
+
+                for file in item.files:
+                    grade.files.add_file(file)
+
+                student.add_grade(grade)
 
     def __deserialize_files(self, parent_element):
         for file_element in parent_element.xpath('./file'):
             yield StoredFile(
                 file_element.attrib['filename'],
-                file_element.attrib['path']
+                file_element.attrib['path'],
+                file_element.attrib.get('hash')
             )
@@ -1,3 +1,5 @@
+from .context import DeserializationContext
+from .grading import GradingPolicyDeserializer
 from .homeworkcategory import HomeWorkCategoryDeserializer
 from .test import TestDeserializer
 from .teacher import TeacherDeserializer
@@ -17,39 +19,33 @@ class SubjectDeserializer:
             self.__subject_element.attrib['name'],
             self.__subject_element.attrib['year']
         )
+        context = DeserializationContext(subject)
 
         for action in ProgressChecker(self.__subject_element).find_out_progress():
             subject.finish_action(action)
 
+        grading_element = self.__subject_element.find('grading')
+        if grading_element is not None:
+            GradingPolicyDeserializer(context, grading_element).deserialize()
+
         for finalexam_element in self.__subject_element.xpath('//finalexams/finalexam'):
-            final_exam = FinalExamDeserializer(subject, finalexam_element).deserialize()
-            subject.add_final_exam(final_exam)
+            final_exam = FinalExamDeserializer(context, finalexam_element).deserialize()
+            context.add_final_exam(final_exam)
 
         for test_element in self.__subject_element.xpath('//tests/test'):
-            test = TestDeserializer(subject, test_element).deserialize()
-            subject.add_test(test)
+            test = TestDeserializer(context, test_element).deserialize()
+            context.add_test(test)
 
         for category_element in self.__subject_element.xpath('//homeworks/category'):
-            home_work_category = HomeWorkCategoryDeserializer(subject, category_element).deserialize()
-            subject.add_home_work_category(home_work_category)
+            home_work_category = HomeWorkCategoryDeserializer(context, category_element).deserialize()
+            context.add_home_work_category(home_work_category)
 
         for student_element in self.__subject_element.xpath('//students/student'):
-            home_works = [
-                home_work
-                    for home_work_category in subject.home_work_categories
-                        for home_work in home_work_category.home_works
-            ]
-            student = StudentDeserializer(
-                subject,
-                subject.tests,
-                home_works,
-                subject.final_exams,
-                student_element
-            ).deserialize()
+            student = StudentDeserializer(context, student_element).deserialize()
             subject.add_student(student)
 
         for teacher_element in self.__subject_element.xpath('//teachers/teacher'):
-            teacher = TeacherDeserializer(subject, teacher_element).deserialize()
+            teacher = TeacherDeserializer(context, teacher_element).deserialize()
             subject.add_teacher(teacher)
 
         return subject
@@ -2,21 +2,21 @@ from vgrabber.model import Teacher, Group
 
 
 class TeacherDeserializer:
-    def __init__(self, subject, teacher_element):
-        self.__subject = subject
+    def __init__(self, context, teacher_element):
+        self.__context = context
         self.__teacher_element = teacher_element
 
     def deserialize(self):
         if 'name' in self.__teacher_element.attrib:
             teacher = Teacher(
-                self.__subject,
+                self.__context.subject,
                 self.__teacher_element.attrib['name'],
                 self.__teacher_element.attrib['surname'],
                 int(self.__teacher_element.attrib['moodleid']),
                 self.__teacher_element.attrib['moodleemail']
             )
         else:
-            teacher = Teacher(self.__subject, None, None, None, None)
+            teacher = Teacher(self.__context.subject, None, None, None, None)
 
         for group_element in self.__teacher_element.xpath('./group'):
             moodleid = None
@@ -24,7 +24,7 @@ class TeacherDeserializer:
                 moodleid = int(group_element.attrib['moodleid'])
 
             group = Group(
-                self.__subject,
+                self.__context.subject,
                 group_element.attrib.get('number'),
                 moodleid,
                 group_element.attrib.get('moodlename')
@@ -2,16 +2,19 @@ from vgrabber.model import Test
 
 
 class TestDeserializer:
-    def __init__(self, subject, test_element):
-        self.__subject = subject
+    def __init__(self, context, test_element):
+        self.__context = context
         self.__test_element = test_element
 
     def deserialize(self):
         test = Test(
-            self.__subject,
+            self.__context.subject,
             int(self.__test_element.attrib['id']),
             self.__test_element.attrib['name'],
             int(self.__test_element.attrib['moodleid'])
         )
 
+        if 'weight' in self.__test_element.attrib:
+            test.weight = float(self.__test_element.attrib['weight'])
+
         return test
@@ -1,3 +1,5 @@
 from .fileaccessor import FileAccessor
+from .compression import CompressionPolicy
 from .directory import DirectoryFileAccessor
 from .zip import ZipFileAccessor
+from .sqlite import SqliteFileAccessor
@@ -0,0 +1,46 @@
+import os.path
+import zlib
+from zipfile import ZIP_STORED, ZIP_DEFLATED
+
+
+class CompressionPolicy:
+    STORED_EXTENSIONS = frozenset({
+        '.zip', '.rar', '.7z', '.gz', '.bz2', '.xz', '.jar', '.docx', '.xlsx', '.pptx', '.odt', '.ods', '.odp',
+        '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.mp3', '.mp4', '.mkv', '.avi', '.mov', '.webm',
+    })
+    DEFLATED_EXTENSIONS = frozenset({
+        '.xml', '.html', '.htm', '.txt', '.csv', '.json', '.py', '.c', '.h', '.cpp', '.java', '.js', '.css',
+        '.md', '.tex', '.svg', '.sql',
+    })
+
+    SNIFF_SIZE = 16 * 1024
+
+    # compressed to uncompressed size of the sniffed data above which deflate is not worth its time
+    STORED_RATIO = 0.9
+
+    level: int
+
+    # level 6 deflates text 5 times slower than level 1 and saves only a few percent more
+    def __init__(self, level=1):
+        self.level = level
+
+    def get_compress_type_for_name(self, name):
+        extension = os.path.splitext(name)[1].lower()
+
+        if extension in self.STORED_EXTENSIONS:
+            return ZIP_STORED
+        elif extension in self.DEFLATED_EXTENSIONS:
+            return ZIP_DEFLATED
+        else:
+            return None
+
+    def get_compress_type_for_data(self, data):
+        if not data:
+            return ZIP_STORED
+
+        # a trial deflate of the head runs in C, unlike counting the byte frequencies
+        head = bytes(data[:self.SNIFF_SIZE])
+        if len(zlib.compress(head, 1)) > len(head) * self.STORED_RATIO:
+            return ZIP_STORED
+        else:
+            return ZIP_DEFLATED
@@ -1,6 +1,9 @@
 import os.path
-from typing import BinaryIO
+from shutil import copyfileobj
+from typing import BinaryIO, Iterable, Optional, Tuple
 
+from vgrabber.utilities.filename import correct_file_name
+from .extractioncache import ExtractionCache
 from .fileaccessor import FileAccessor
 
 
@@ -8,21 +11,43 @@ class DirectoryFileAccessor(FileAccessor):
     def __init__(self, path: str):
         self.__path = path
         self.__intern_path = None
+        self.__extraction_cache = ExtractionCache()
 
     def ensure_exists(self):
-        if not os.path.exists(self.__path):
-            os.makedirs(self.__path)
+        os.makedirs(self.__path, exist_ok=True)
 
     def open_file(self, name: str, mode: str) -> BinaryIO:
         ret: BinaryIO = open(os.path.join(self.__path, name.replace('/', os.path.sep)), mode + 'b')
         return ret
 
-    def open_file_for_external_app(self, rel_path: str) -> str:
-        return os.path.abspath(os.path.join(self.__path, rel_path.replace('/', os.path.sep)))
+    def get_file_stats(self, name: str) -> Optional[Tuple[int, float]]:
+        try:
+            stat = os.stat(os.path.join(self.__path, name.replace('/', os.path.sep)))
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime
+
+    def get_file_system_path(self, name: str) -> Optional[str]:
+        return os.path.abspath(os.path.join(self.__path, name.replace('/', os.path.sep)))
+
+    def open_file_for_external_app(self, rel_path: str, file_name: Optional[str] = None) -> str:
+        if file_name is None:
+            file_name = rel_path.split('/')[-1]
+
+        # objects are shared by every submission with the same content, the app gets a copy it may change
+        file_path = self.get_file_system_path(rel_path)
+        size, mtime = self.get_file_stats(rel_path)
+
+        def extract(new_file):
+            with open(file_path, 'rb') as old_file:
+                copyfileobj(old_file, new_file)
+
+        return self.__extraction_cache.get(self.__path, rel_path, (size, mtime), correct_file_name(file_name), extract)
 
     def open_folder(self, *names: str) -> 'FileAccessor':
         ret = DirectoryFileAccessor(os.path.join(self.__path, *names))
         ret.__intern_path = self.get_relative_path(*names)
+        ret.__extraction_cache = self.__extraction_cache
         return ret
 
     def get_relative_path(self, *names: str) -> str:
@@ -31,5 +56,31 @@ class DirectoryFileAccessor(FileAccessor):
         else:
             return '/'.join([self.__intern_path, *names])
 
+    def list_files(self) -> Iterable[str]:
+        for dir_path, dir_names, file_names in os.walk(self.__path):
+            rel_dir = os.path.relpath(dir_path, self.__path)
+            for file_name in file_names:
+                if rel_dir == os.curdir:
+                    yield file_name
+                else:
+                    yield '/'.join([*rel_dir.split(os.path.sep), file_name])
+
+    def get_storage_stats(self) -> Optional[Tuple[int, int]]:
+        return None
+
+    def compact(self, removed_files: Iterable[str] = ()) -> int:
+        reclaimed = 0
+
+        for name in removed_files:
+            path = os.path.join(self.__path, name.replace('/', os.path.sep))
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            reclaimed += size
+
+        return reclaimed
+
     def close(self):
         pass
@@ -0,0 +1,73 @@
+import hashlib
+import os
+import os.path
+from shutil import rmtree
+from tempfile import mkstemp
+from typing import Callable, BinaryIO, Optional
+
+
+def get_default_cache_directory():
+    if 'LOCALAPPDATA' in os.environ:
+        cache_root = os.environ['LOCALAPPDATA']
+    else:
+        cache_root = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+
+    return os.path.join(cache_root, 'vgrabber', 'extracted')
+
+
+class ExtractionCache:
+    directory: str
+    max_size: int
+
+    def __init__(self, directory: Optional[str] = None, max_size=512 * 1024 * 1024):
+        if directory is None:
+            directory = get_default_cache_directory()
+
+        self.directory = directory
+        self.max_size = max_size
+
+    def get(self, source: str, name: str, version, file_name: str, extract: Callable[[BinaryIO], None]) -> str:
+        key = hashlib.sha256('\0'.join([os.path.abspath(source), name, str(version)]).encode('utf-8')).hexdigest()
+        entry_dir = os.path.join(self.directory, key)
+        file_path = os.path.join(entry_dir, file_name)
+
+        if os.path.exists(file_path):
+            # the entry directory modification time drives the eviction order
+            os.utime(entry_dir)
+            return file_path
+
+        os.makedirs(entry_dir, exist_ok=True)
+
+        fd, temp_file_path = mkstemp(dir=entry_dir)
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                extract(temp_file)
+            os.replace(temp_file_path, file_path)
+        except BaseException:
+            os.remove(temp_file_path)
+            raise
+
+        self.__evict(entry_dir)
+
+        return file_path
+
+    def __evict(self, keep_dir):
+        entries = []
+        total_size = 0
+
+        for entry in os.scandir(self.directory):
+            if not entry.is_dir():
+                continue
+
+            size = sum(file.stat().st_size for file in os.scandir(entry.path) if file.is_file())
+            entries.append((entry.stat().st_mtime, size, entry.path))
+            total_size += size
+
+        for mtime, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            if path == keep_dir:
+                continue
+
+            rmtree(path, ignore_errors=True)
+            total_size -= size
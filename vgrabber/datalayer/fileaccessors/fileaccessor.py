@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import BinaryIO
+from typing import BinaryIO, Iterable, Optional, Tuple
 
 
 class FileAccessor(ABC):
@@ -12,7 +12,15 @@ class FileAccessor(ABC):
         pass
 
     @abstractmethod
-    def open_file_for_external_app(self, rel_path: str) -> str:
+    def get_file_stats(self, name: str) -> Optional[Tuple[int, float]]:
+        pass
+
+    @abstractmethod
+    def get_file_system_path(self, name: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def open_file_for_external_app(self, rel_path: str, file_name: Optional[str] = None) -> str:
         pass
 
     @abstractmethod
@@ -23,6 +31,18 @@ class FileAccessor(ABC):
     def get_relative_path(self, *names: str) -> str:
         pass
 
+    @abstractmethod
+    def list_files(self) -> Iterable[str]:
+        pass
+
+    @abstractmethod
+    def get_storage_stats(self) -> Optional[Tuple[int, int]]:
+        pass
+
+    @abstractmethod
+    def compact(self, removed_files: Iterable[str] = ()) -> int:
+        pass
+
     @abstractmethod
     def close(self):
         pass
@@ -0,0 +1,220 @@
+import sqlite3
+import time
+from io import BytesIO, RawIOBase, SEEK_SET, SEEK_END
+from shutil import copyfileobj
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Iterable, Union, Optional, Tuple
+
+from vgrabber.datalayer.fileaccessors import FileAccessor
+from vgrabber.utilities.filename import correct_file_name
+from .extractioncache import ExtractionCache
+
+
+class SqliteFileWriter(RawIOBase):
+    # the blob has to be created with its final size, so the file is spooled until it is closed
+    MAX_IN_MEMORY_SIZE = 1024 * 1024
+
+    __CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, connection: sqlite3.Connection, file_path: str):
+        super().__init__()
+        self.__connection = connection
+        self.__file_path = file_path
+        self.__spool = SpooledTemporaryFile(self.MAX_IN_MEMORY_SIZE)
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self.__spool.write(data)
+
+    def close(self):
+        if not self.closed:
+            try:
+                self.__store()
+            finally:
+                self.__spool.close()
+        super().close()
+
+    def __store(self):
+        size = self.__spool.tell()
+        self.__spool.seek(0)
+
+        if not hasattr(self.__connection, 'blobopen'):
+            self.__connection.execute(
+                'INSERT OR REPLACE INTO files (path, data, mtime) VALUES (?, ?, ?)',
+                (self.__file_path, self.__spool.read(), time.time())
+            )
+            return
+
+        cursor = self.__connection.execute(
+            'INSERT OR REPLACE INTO files (path, data, mtime) VALUES (?, zeroblob(?), ?)',
+            (self.__file_path, size, time.time())
+        )
+        with self.__connection.blobopen('files', 'data', cursor.lastrowid) as blob:
+            for chunk in iter(lambda: self.__spool.read(self.__CHUNK_SIZE), b''):
+                blob.write(chunk)
+
+
+class SqliteFileReader(RawIOBase):
+    def __init__(self, blob):
+        super().__init__()
+        self.__blob = blob
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.__blob.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=SEEK_SET):
+        # the blob refuses positions outside of the data
+        if whence == SEEK_SET:
+            position = offset
+        else:
+            position = (len(self.__blob) if whence == SEEK_END else self.__blob.tell()) + offset
+        self.__blob.seek(min(max(0, position), len(self.__blob)))
+        return self.__blob.tell()
+
+    def tell(self):
+        return self.__blob.tell()
+
+    def close(self):
+        if not self.closed:
+            self.__blob.close()
+        super().close()
+
+
+class SqliteFileAccessorInfo:
+    __schema = '''
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            data BLOB NOT NULL,
+            mtime REAL NOT NULL
+        );
+    '''
+
+    def __init__(self, file: str):
+        self.__file_name = file
+        self.connection = sqlite3.connect(file)
+        self.connection.executescript(self.__schema)
+        self.__extraction_cache = ExtractionCache()
+
+    def read_file(self, path):
+        row = self.connection.execute('SELECT data FROM files WHERE path = ?', (path,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(path)
+        return row[0]
+
+    def open_file_for_reading(self, path):
+        # incremental blob reads keep a large file out of memory where sqlite3 supports them
+        if not hasattr(self.connection, 'blobopen'):
+            return BytesIO(self.read_file(path))
+
+        row = self.connection.execute('SELECT rowid FROM files WHERE path = ?', (path,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(path)
+        return SqliteFileReader(self.connection.blobopen('files', 'data', row[0], readonly=True))
+
+    def get_file_stats(self, path):
+        return self.connection.execute(
+            'SELECT length(data), mtime FROM files WHERE path = ?', (path,)
+        ).fetchone()
+
+    def save_file(self, file_name, path):
+        size, mtime = self.get_file_stats(path)
+
+        def extract(new_file):
+            with self.open_file_for_reading(path) as old_file:
+                copyfileobj(old_file, new_file)
+
+        return self.__extraction_cache.get(self.__file_name, path, mtime, file_name, extract)
+
+    def get_storage_stats(self):
+        page_size, = self.connection.execute('PRAGMA page_size').fetchone()
+        page_count, = self.connection.execute('PRAGMA page_count').fetchone()
+        freelist_count, = self.connection.execute('PRAGMA freelist_count').fetchone()
+        return page_count * page_size, freelist_count * page_size
+
+    def list_files(self, path):
+        return [
+            file_path[len(path):]
+                for file_path, in self.connection.execute(
+                    'SELECT path FROM files WHERE substr(path, 1, ?) = ?', (len(path), path)
+                )
+        ]
+
+    def compact(self, removed_paths=()):
+        old_size, wasted_size = self.get_storage_stats()
+
+        self.connection.executemany('DELETE FROM files WHERE path = ?', ((path,) for path in removed_paths))
+        self.connection.commit()
+        self.connection.execute('VACUUM')
+
+        new_size, wasted_size = self.get_storage_stats()
+        return old_size - new_size
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+
+class SqliteFileAccessor(FileAccessor):
+    def __init__(self, file: Union[str, SqliteFileAccessorInfo]):
+        if isinstance(file, str):
+            self.__info = SqliteFileAccessorInfo(file)
+        else:
+            self.__info = file
+        self.__path = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return self.__info.connection
+
+    def ensure_exists(self):
+        pass
+
+    def open_file(self, name: str, mode: str) -> BinaryIO:
+        if mode == 'r':
+            return self.__info.open_file_for_reading(self.get_relative_path(name))
+        elif mode == 'w':
+            return SqliteFileWriter(self.__info.connection, self.get_relative_path(name))
+
+    def get_file_stats(self, name: str) -> Optional[Tuple[int, float]]:
+        return self.__info.get_file_stats(self.get_relative_path(name))
+
+    def get_file_system_path(self, name: str) -> Optional[str]:
+        return None
+
+    def open_file_for_external_app(self, rel_path: str, file_name: Optional[str] = None) -> str:
+        if file_name is None:
+            file_name = rel_path.split('/')[-1]
+        return self.__info.save_file(correct_file_name(file_name), rel_path)
+
+    def open_folder(self, *names: str) -> 'FileAccessor':
+        ret = SqliteFileAccessor(self.__info)
+        ret.__path = self.get_relative_path(*names)
+        return ret
+
+    def get_relative_path(self, *names: str) -> str:
+        if self.__path is None:
+            return '/'.join(names)
+        else:
+            return '/'.join([self.__path, *names])
+
+    def get_storage_stats(self) -> Optional[Tuple[int, int]]:
+        return self.__info.get_storage_stats()
+
+    def list_files(self) -> Iterable[str]:
+        return self.__info.list_files(self.get_relative_path(''))
+
+    def compact(self, removed_files: Iterable[str] = ()) -> int:
+        return self.__info.compact([self.get_relative_path(name) for name in removed_files])
+
+    def close(self):
+        self.__info.close()
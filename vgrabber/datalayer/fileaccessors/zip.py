@@ -1,57 +1,343 @@
+import datetime
 import os.path
-from io import BytesIO
-from shutil import copyfileobj, rmtree
-from tempfile import mkdtemp
-from typing import BinaryIO, Union, List, Iterable, T
-from zipfile import ZipFile
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from io import RawIOBase, SEEK_SET, SEEK_CUR, SEEK_END
+from shutil import copyfileobj
+from tempfile import mkstemp, SpooledTemporaryFile
+from typing import BinaryIO, Union, List, Iterable, T, Optional, Tuple
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED, ZIP64_LIMIT
 
 from vgrabber.datalayer.fileaccessors import FileAccessor
+from vgrabber.utilities.filename import correct_file_name
+from .compression import CompressionPolicy
+from .extractioncache import ExtractionCache
 
 
-class ZipFileWriter(BytesIO):
-    def __init__(self, file: ZipFile, file_path: str):
+class ZipFileWriter(RawIOBase):
+    # files which may be deflated are spooled and compressed by a worker, stored ones go straight into the archive
+    def __init__(self, info: 'ZipFileAccessorInfo', file_path: str):
         super().__init__()
-        self.__file = file
+        self.__info = info
         self.__file_path = file_path
-        self.__closed = False
+        self.__compress_type = info.compression_policy.get_compress_type_for_name(file_path)
+        self.__entry = None
+        self.__spool = None
+
+        if self.__compress_type == ZIP_STORED:
+            self.__entry = info.open_stored_entry(file_path)
+        else:
+            self.__spool = SpooledTemporaryFile(info.SPOOL_SIZE)
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if self.__entry is not None:
+            return self.__entry.write(data)
+        return self.__spool.write(data)
 
     def close(self):
-        if not self.__closed:
-            super().flush()
-            self.__file.writestr(self.__file_path, self.getvalue())
-            super().close()
-            self.__closed = True
+        if not self.closed:
+            if self.__entry is not None:
+                self.__entry.close()
+            else:
+                self.__info.add_entry(self.__file_path, self.__compress_type, self.__spool)
+        super().close()
+
+
+class ZipRawEntryReader(RawIOBase):
+    # reads the data of an entry as it lies in the archive, seeking does not read through the data
+    def __init__(self, file: BinaryIO, offset: int, size: int):
+        super().__init__()
+        self.__file = file
+        self.__offset = offset
+        self.__size = size
+        self.__position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        length = min(len(buffer), self.__size - self.__position)
+        if length <= 0:
+            return 0
+
+        self.__file.seek(self.__offset + self.__position)
+        data = self.__file.read(length)
+        buffer[:len(data)] = data
+        self.__position += len(data)
+        return len(data)
+
+    def seek(self, offset, whence=SEEK_SET):
+        if whence == SEEK_SET:
+            self.__position = offset
+        elif whence == SEEK_CUR:
+            self.__position += offset
+        elif whence == SEEK_END:
+            self.__position = self.__size + offset
+        self.__position = max(0, self.__position)
+        return self.__position
+
+    def tell(self):
+        return self.__position
+
+    def close(self):
+        if not self.closed:
+            self.__file.close()
+        super().close()
 
 
 class ZipFileAccessorInfo:
-    def __init__(self, file: str):
-        self.file = ZipFile(file, 'a')
+    compression_policy: CompressionPolicy
+
+    # entries compressed side by side, twice as many may wait in spools to be appended
+    MAX_WORKERS = 4
+    SPOOL_SIZE = 1024 * 1024
+
+    __CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, file: str, compression_policy: Optional[CompressionPolicy] = None):
+        if compression_policy is None:
+            compression_policy = CompressionPolicy()
+
+        self.__file_name = file
+        self.compression_policy = compression_policy
+        self.file = self.__open_archive()
         self.common_prefix = self.__get_common_prefix()
-        self.__temp_dirs = []
+        self.__extraction_cache = ExtractionCache()
+        self.__executor = None
+        self.__pending_entries = deque()
+        self.__pending_infos = {}
+
+    def open_stored_entry(self, path):
+        # there is nothing to compress, the entries added before it are appended first
+        self.flush()
+
+        info = ZipInfo(path, time.localtime(time.time())[:6])
+        info.compress_type = ZIP_STORED
+
+        # the size is not known up front, without zip64 headers entries over 2 GiB could not be finished
+        return self.file.open(info, 'w', force_zip64=True)
+
+    def add_entry(self, path, compress_type, spool):
+        info = ZipInfo(path, time.localtime(time.time())[:6])
+        info.external_attr = 0o600 << 16
+        info.file_size = spool.tell()
+
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(self.MAX_WORKERS)
+
+        self.__pending_entries.append((info, self.__executor.submit(self.__compress_entry, info, compress_type, spool)))
+        self.__pending_infos[path] = info
+
+        while len(self.__pending_entries) > 2 * self.MAX_WORKERS:
+            self.__append_next_entry()
+
+    def getinfo(self, path):
+        # entries still being compressed already have their name, size and time
+        info = self.__pending_infos.get(path)
+        if info is None:
+            info = self.file.getinfo(path)
+        return info
+
+    def flush(self):
+        while self.__pending_entries:
+            self.__append_next_entry()
+
+    def get_entry_name(self, path):
+        # older versions wrote entries with a leading slash, which shows up as an empty prefix
+        if self.common_prefix is None:
+            return path
+        return f"{self.common_prefix}/{path.lstrip('/')}"
+
+    def open_entry_for_reading(self, path):
+        self.flush()
+
+        info = self.file.getinfo(path)
+
+        if info.compress_type != ZIP_STORED:
+            return self.file.open(info, 'r')
+
+        # entries written since the archive was opened may still be buffered
+        self.file.fp.flush()
+
+        return self.__open_raw_entry(info)
 
     def save_file(self, file_name, path):
-        dir_name = mkdtemp()
-        file_path = os.path.join(dir_name, file_name)
+        path = self.get_entry_name(path)
 
-        if self.common_prefix:
-            path = f"{self.common_prefix}/{path}"
+        self.flush()
 
-        with open(file_path, 'wb') as new_file:
-            with self.file.open(path, 'r') as old_file:
+        info = self.file.getinfo(path)
+
+        def extract(new_file):
+            with self.file.open(info, 'r') as old_file:
                 copyfileobj(old_file, new_file)
 
-        self.__temp_dirs.append(dir_name)
+        return self.__extraction_cache.get(self.__file_name, path, info.CRC, file_name, extract)
 
-        return file_path
+    def get_storage_stats(self):
+        self.flush()
 
-    def close(self):
-        for dir_name in self.__temp_dirs:
-            rmtree(dir_name, ignore_errors=True)
+        latest_infos = set(map(id, self.__get_latest_infos()))
+
+        wasted_size = sum(
+            info.compress_size
+                for info in self.file.infolist()
+                    if id(info) not in latest_infos
+        )
+
+        return os.path.getsize(self.__file_name), wasted_size
+
+    def list_files(self, path):
+        self.flush()
 
+        prefix = self.get_entry_name(path)
+        return [
+            info.filename[len(prefix):]
+                for info in self.__get_latest_infos()
+                    if info.filename.startswith(prefix) and not info.is_dir()
+        ]
+
+    def compact(self, removed_paths=()):
+        # rewrites the archive with only the latest entry of each name and swaps it in at once
+        removed_names = {self.get_entry_name(path) for path in removed_paths}
+        self.flush()
         self.file.close()
+        old_size = os.path.getsize(self.__file_name)
+
+        fd, temp_file_name = mkstemp(dir=os.path.dirname(os.path.abspath(self.__file_name)), suffix='.zip')
+        os.close(fd)
+
+        try:
+            with ZipFile(self.__file_name, 'r') as old_file, ZipFile(temp_file_name, 'w') as new_file:
+                for info in self.__get_latest_infos(old_file):
+                    if info.filename in removed_names:
+                        continue
+
+                    # the compressed data is copied as it is, nothing is inflated and deflated again
+                    new_info = ZipInfo(info.filename, info.date_time)
+                    new_info.compress_type = info.compress_type
+                    new_info.external_attr = info.external_attr
+                    new_info.file_size = info.file_size
+                    new_info.compress_size = info.compress_size
+                    new_info.CRC = info.CRC
+
+                    with self.__open_raw_entry(info) as old_entry:
+                        self.__append_raw_entry(new_file, new_info, old_entry)
+
+            os.replace(temp_file_name, self.__file_name)
+        except BaseException:
+            os.remove(temp_file_name)
+            raise
+        finally:
+            self.file = self.__open_archive()
+
+        return old_size - os.path.getsize(self.__file_name)
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self.__executor is not None:
+                self.__executor.shutdown()
+                self.__executor = None
+            self.file.close()
+
+    def __compress_entry(self, info, compress_type, spool):
+        # runs in a worker, zlib does not hold the GIL while it compresses or computes the CRC
+        spool.seek(0)
+        if compress_type is None:
+            compress_type = self.compression_policy.get_compress_type_for_data(
+                spool.read(self.compression_policy.SNIFF_SIZE)
+            )
+            spool.seek(0)
+
+        crc = 0
+        if compress_type == ZIP_STORED:
+            for chunk in iter(lambda: spool.read(self.__CHUNK_SIZE), b''):
+                crc = zlib.crc32(chunk, crc)
+            data = spool
+        else:
+            compressor = zlib.compressobj(self.compression_policy.level, zlib.DEFLATED, -15)
+            data = SpooledTemporaryFile(self.SPOOL_SIZE)
+            with spool:
+                for chunk in iter(lambda: spool.read(self.__CHUNK_SIZE), b''):
+                    crc = zlib.crc32(chunk, crc)
+                    data.write(compressor.compress(chunk))
+            data.write(compressor.flush())
+
+        info.compress_type = compress_type
+        info.CRC = crc
+        info.compress_size = data.tell()
+        return data
+
+    def __append_next_entry(self):
+        # entries go to the archive in the order they were added, whichever worker finishes first
+        info, future = self.__pending_entries.popleft()
+        if self.__pending_infos.get(info.filename) is info:
+            del self.__pending_infos[info.filename]
+
+        with future.result() as data:
+            data.seek(0)
+            self.__append_raw_entry(self.file, info, data)
+
+    def __append_raw_entry(self, file, info, data):
+        # what ZipFile.open(info, 'w') and closing the entry do, for data compressed already
+        zip64 = info.file_size > ZIP64_LIMIT or info.compress_size > ZIP64_LIMIT
+
+        if file._writing:
+            raise ValueError("An entry cannot be appended while a stored entry is being written")
+
+        file.fp.seek(file.start_dir)
+        info.header_offset = file.fp.tell()
+        file._writecheck(info)
+        file._didModify = True
+
+        file.fp.write(info.FileHeader(zip64))
+        copyfileobj(data, file.fp, self.__CHUNK_SIZE)
+
+        file.start_dir = file.fp.tell()
+        file.filelist.append(info)
+        file.NameToInfo[info.filename] = info
+
+    def __open_raw_entry(self, info):
+        # the compressed data of the entry, found past its local header
+        file = open(self.__file_name, 'rb')
+        try:
+            file.seek(info.header_offset + 26)
+            file_name_length, extra_length = struct.unpack('<2H', file.read(4))
+        except BaseException:
+            file.close()
+            raise
+
+        return ZipRawEntryReader(file, info.header_offset + 30 + file_name_length + extra_length, info.compress_size)
+
+    def __open_archive(self):
+        return ZipFile(self.__file_name, 'a', compression=ZIP_DEFLATED, compresslevel=self.compression_policy.level)
+
+    def __get_latest_infos(self, file=None):
+        if file is None:
+            file = self.file
+
+        latest_infos = {}
+        for info in file.infolist():
+            latest_infos[info.filename] = info
+
+        return latest_infos.values()
 
     def __get_common_prefix(self):
-        return '/'.join(self.__common_list_prefix([x.split('/') for x in self.file.namelist()]))
+        prefix = list(self.__common_list_prefix([x.split('/')[:-1] for x in self.file.namelist()]))
+        if not prefix:
+            return None
+        return '/'.join(prefix)
 
     def __common_list_prefix(self, data: Iterable[Iterable[T]]) -> Iterable[T]:
         for components in zip(*data):
@@ -62,26 +348,39 @@ class ZipFileAccessorInfo:
 
 
 class ZipFileAccessor(FileAccessor):
-    def __init__(self, file: Union[str, ZipFileAccessorInfo]):
+    def __init__(self, file: Union[str, ZipFileAccessorInfo], compression_policy: Optional[CompressionPolicy] = None):
         if isinstance(file, str):
-            self.__info = ZipFileAccessorInfo(file)
-            self.__path = self.__info.common_prefix
+            self.__info = ZipFileAccessorInfo(file, compression_policy)
         else:
             self.__info = file
-            self.__path = None
+        self.__path = None
 
     def ensure_exists(self):
         pass
 
     def open_file(self, name: str, mode: str) -> BinaryIO:
         if mode == 'r':
-            return self.__info.file.open(self.get_relative_path(name))
+            return self.__info.open_entry_for_reading(self.__info.get_entry_name(self.get_relative_path(name)))
         elif mode == 'w':
-            return ZipFileWriter(self.__info.file, self.get_relative_path(name))
+            # a stored file streams straight into the archive, no other file can be written until it is closed
+            return ZipFileWriter(self.__info, self.__info.get_entry_name(self.get_relative_path(name)))
+
+    def get_file_stats(self, name: str) -> Optional[Tuple[int, float]]:
+        try:
+            info = self.__info.getinfo(self.__info.get_entry_name(self.get_relative_path(name)))
+        except KeyError:
+            return None
+        # zip stores the time with 2 second precision, an entry just written still has the exact one
+        year, month, day, hour, minute, second = info.date_time
+        return info.file_size, datetime.datetime(year, month, day, hour, minute, second - second % 2).timestamp()
 
-    def open_file_for_external_app(self, rel_path: str) -> str:
-        name = rel_path.split('/')[-1]
-        return self.__info.save_file(name, rel_path)
+    def get_file_system_path(self, name: str) -> Optional[str]:
+        return None
+
+    def open_file_for_external_app(self, rel_path: str, file_name: Optional[str] = None) -> str:
+        if file_name is None:
+            file_name = rel_path.split('/')[-1]
+        return self.__info.save_file(correct_file_name(file_name), rel_path)
 
     def open_folder(self, *names: str) -> 'FileAccessor':
         ret = ZipFileAccessor(self.__info)
@@ -94,5 +393,14 @@ class ZipFileAccessor(FileAccessor):
         else:
             return '/'.join([self.__path, *names])
 
+    def get_storage_stats(self) -> Optional[Tuple[int, int]]:
+        return self.__info.get_storage_stats()
+
+    def list_files(self) -> Iterable[str]:
+        return self.__info.list_files(self.get_relative_path(''))
+
+    def compact(self, removed_files: Iterable[str] = ()) -> int:
+        return self.__info.compact([self.get_relative_path(name) for name in removed_files])
+
     def close(self):
         self.__info.close()
@@ -1,112 +1,136 @@
-from shutil import copyfileobj
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Iterable, Callable
 
-from vgrabber.model import Subject, Student, StudentGrade, HomeWorkPoints, TestPoints
-from vgrabber.model.files import FileList, InMemoryFile, StoredFile, ExternalFile
-from vgrabber.utilities.filename import correct_file_name
+from vgrabber.model import Subject, Student
+from vgrabber.model.files import SpooledFile, StoredFile, ExternalFile
+from .contentstore import ContentStore
 from .fileaccessors import FileAccessor
 
 
 class FileSaver:
-    def __init__(self, old_file_accessor: Optional[FileAccessor], file_accessor: FileAccessor):
-        self.__old_file_accessor_root = old_file_accessor
-        self.__file_accessor_root = file_accessor
-
-    def save_subject_files(self, subject: Subject):
-        self.__save_subject_files(self.__file_accessor_root, subject)
-
-    def __save_subject_files(self, file_accessor: FileAccessor, subject: Subject):
-        for student in subject.students:
-            self.__save_student_files(file_accessor, student)
-
-    def __save_student_files(self, file_accessor: FileAccessor, student: Student):
-        student_dir = file_accessor.open_folder(
-            correct_file_name(
-                '{0}_{1}{2}'.format(student.number, student.surname, student.name)
-            )
-        )
+    MAX_WORKERS = 8
+    BATCH_SIZE = 256
 
+    def __init__(self, old_file_accessor: Optional[FileAccessor], file_accessor: FileAccessor,
+                 progress: Optional[Callable[[int, int], None]] = None):
+        self.__old_file_accessor_root = old_file_accessor
+        self.__content_store = ContentStore(file_accessor)
+        self.__progress = progress
+
+        # only plain files can be written from several threads, zip and sqlite handles are not shareable
+        self.__concurrent_target = file_accessor.get_file_system_path('') is not None
+        self.__concurrent_source = old_file_accessor is None or old_file_accessor.get_file_system_path('') is not None
+
+    def save_subject_files(self, subject: Subject, students: Optional[Iterable[Student]] = None):
+        if students is None:
+            students = subject.students
+
+        file_lists = []
+        for student in students:
+            file_lists.extend(file_list for file_list in self.__get_file_lists(student) if file_list.files)
+
+        total = sum(len(file_list.files) for file_list in file_lists)
+        batches = list(self.__get_batches(file_lists))
+
+        # a thread per file costs more than copying a small file, so the pool gets whole batches
+        # and is skipped entirely when there is nothing to run side by side
+        if len(batches) > 1 and self.__concurrent_target:
+            with ThreadPoolExecutor(min(self.MAX_WORKERS, len(batches))) as executor:
+                futures = [
+                    executor.submit(self.__save_batch, batch) if self.__can_save_concurrently(batch) else None
+                        for batch in batches
+                ]
+
+                done = 0
+                for batch, future in zip(batches, futures):
+                    if future is None:
+                        saved_batch = self.__save_batch(batch)
+                    else:
+                        saved_batch = future.result()
+                    done = self.__replace_batch(batch, saved_batch, done, total)
+        else:
+            done = 0
+            for batch in batches:
+                done = self.__replace_batch(batch, self.__save_batch(batch), done, total)
+
+    def __get_batches(self, file_lists):
+        batch = []
+        batch_size = 0
+        for file_list in file_lists:
+            batch.append(file_list)
+            batch_size += len(file_list.files)
+            if batch_size >= self.BATCH_SIZE:
+                yield batch
+                batch = []
+                batch_size = 0
+
+        if batch:
+            yield batch
+
+    def __can_save_concurrently(self, batch):
+        if self.__concurrent_source:
+            return True
+
+        return not any(isinstance(file, StoredFile) for file_list in batch for file in file_list)
+
+    def __save_batch(self, batch):
+        return [self.__save_files(list(file_list)) for file_list in batch]
+
+    def __replace_batch(self, batch, saved_batch, done, total):
+        for file_list, new_files in zip(batch, saved_batch):
+            file_list.replace(new_files)
+            done += len(new_files)
+
+        if self.__progress is not None:
+            self.__progress(done, total)
+
+        return done
+
+    def __get_file_lists(self, student: Student):
         for grade in student.grades:
-            self.__save_grade_files(student_dir, grade)
+            yield grade.files
 
         for home_work_point in student.home_work_points:
-            self.__save_home_work_files(student_dir, home_work_point)
+            yield home_work_point.files
 
         for test_points in student.test_points:
-            self.__save_test_files(student_dir, test_points)
-
-    def __save_grade_files(self, file_accessor: FileAccessor, grade: StudentGrade):
-        self.__save_files(
-            file_accessor.open_folder(
-                'finalexams',
-                '{0}_{1}'.format(grade.final_exam.id, grade.final_exam.date_time.isoformat())
-            ),
-            grade.files
-        )
+            yield test_points.files
 
-    def __save_home_work_files(self, file_accessor: FileAccessor, home_work_points: HomeWorkPoints):
-        self.__save_files(
-            file_accessor.open_folder(
-                'homeworks',
-                str(home_work_points.home_work.id)
-            ),
-            home_work_points.files
-        )
+    def __save_files(self, files):
+        return [self.__save_file(file) for file in files]
 
-    def __save_test_files(self, file_accessor: FileAccessor, test_points: TestPoints):
-        self.__save_files(
-            file_accessor.open_folder(
-                'tests',
-                str(test_points.test.id)
-            ),
-            test_points.files
-        )
+    def __save_file(self, file):
+        if isinstance(file, SpooledFile):
+            return self.__save_spooled_file(file)
+        elif isinstance(file, StoredFile):
+            return self.__save_stored_file(file)
+        elif isinstance(file, ExternalFile):
+            return self.__save_external_file(file)
+        else:
+            raise Exception("????")
 
-    def __save_files(self, file_accessor: FileAccessor, file_list: FileList):
-        new_files = []
+    def __save_spooled_file(self, file: SpooledFile):
+        if file.spool_path is not None:
+            return self.__content_store.store_local_file(file.file_name, file.spool_path, file.file_hash)
 
-        for file in file_list:
-            if isinstance(file, InMemoryFile):
-                new_files.append(self.__save_in_memory_file(file_accessor, file))
-            elif isinstance(file, StoredFile):
-                new_files.append(self.__save_stored_file(file_accessor, file))
-            elif isinstance(file, ExternalFile):
-                new_files.append(self.__save_external_file(file_accessor, file))
-            else:
-                raise Exception("????")
+        return self.__content_store.store_file(file.file_name, file.open, file.file_hash)
 
-        file_list.replace(new_files)
-
-    def __save_in_memory_file(self, file_accessor: FileAccessor, file: InMemoryFile):
-        file_accessor.ensure_exists()
-
-        file_name = correct_file_name(file.file_name)
-
-        with file_accessor.open_file(file_name, 'w') as f:
-            f.write(file.data)
-
-        return StoredFile(file.file_name, file_accessor.get_relative_path(file_name))
-
-    def __save_stored_file(self, file_accessor: FileAccessor, file: StoredFile):
+    def __save_stored_file(self, file: StoredFile):
         if self.__old_file_accessor_root is None:
             return file
-        
-        new_file_path = self.__copy_file(file_accessor, file.file_name, file.file_path)
-        
-        return StoredFile(file.file_name, new_file_path)
-    
-    def __save_external_file(self, file_accessor: FileAccessor, file: ExternalFile):
-        new_file_path = self.__copy_file(file_accessor, file.file_name, file.file_path)
-        
-        return StoredFile(file.file_name, new_file_path)
-
-    def __copy_file(self, file_accessor, file_name, file_path):
-        file_accessor.ensure_exists()
-
-        file_name = correct_file_name(file_name)
-
-        with self.__old_file_accessor_root.open_file(file_path, 'r') as old_file:
-            with file_accessor.open_file(file_name, 'w') as new_file:
-                copyfileobj(old_file, new_file)
-        
-        return file_accessor.get_relative_path(file_name)
+
+        # files from the older per-student layout move into the content store on the way
+        # linking or copying by path only pays off when the target is a plain folder too
+        if self.__concurrent_target:
+            source_path = self.__old_file_accessor_root.get_file_system_path(file.file_path)
+            if source_path is not None:
+                return self.__content_store.store_local_file(file.file_name, source_path, file.file_hash)
+
+        return self.__content_store.store_file(
+            file.file_name,
+            lambda: self.__old_file_accessor_root.open_file(file.file_path, 'r'),
+            file.file_hash
+        )
+
+    def __save_external_file(self, file: ExternalFile):
+        return self.__content_store.store_local_file(file.file_name, file.file_path)
@@ -1 +1,2 @@
-from .subject import SubjectSerializer
\ No newline at end of file
+from .subject import SubjectSerializer
+from .progress import ProgressSerializer
@@ -0,0 +1,19 @@
+from lxml.etree import Element
+
+from vgrabber.model import GradingPolicy
+from vgrabber.utilities.number import format_number
+
+
+class GradingPolicySerializer:
+    __grading_policy: GradingPolicy
+
+    def __init__(self, grading_policy):
+        self.__grading_policy = grading_policy
+
+    def serialize(self):
+        grading_element = Element(
+            'grading',
+            minpoints=format_number(self.__grading_policy.minimum_points)
+        )
+
+        return grading_element
@@ -0,0 +1,67 @@
+from lxml.etree import Element
+
+from vgrabber.base.importaction import ImportAction
+from vgrabber.model import Subject
+
+
+class ProgressSerializer:
+    __subject: Subject
+
+    def __init__(self, subject):
+        self.__subject = subject
+
+    def serialize(self):
+        progress_element = Element('progress')
+
+        progress = self.find_out_progress()
+
+        for action in ImportAction:
+            if action in progress:
+                progress_element.append(Element('action', name=action.name))
+
+        return progress_element
+
+    def find_out_progress(self):
+        progress = set()
+
+        if self.__subject.students:
+            progress.add(ImportAction.student_list)
+        if self.__subject.final_exams:
+            progress.add(ImportAction.final_exam_list)
+        if self.__subject.teachers:
+            progress.add(ImportAction.moodle_teacher_list)
+        if self.__subject.tests:
+            progress.add(ImportAction.moodle_test_list)
+
+        if any(final_exam.moodle_id is not None for final_exam in self.__subject.final_exams):
+            progress.add(ImportAction.moodle_final_exam_list)
+        if any(teacher.taught_groups for teacher in self.__subject.teachers):
+            progress.add(ImportAction.moodle_teacher_groups)
+        if any(category.home_works for category in self.__subject.home_work_categories):
+            progress.add(ImportAction.moodle_home_work_list)
+
+        for student in self.__subject.students:
+            if student.moodle_id is not None:
+                progress.add(ImportAction.moodle_student_list)
+
+            for home_work_points in student.home_work_points:
+                if home_work_points.points is not None:
+                    progress.add(ImportAction.moodle_home_work_grades)
+                if any(True for file in home_work_points.files):
+                    progress.add(ImportAction.moodle_home_work_details)
+
+            for test_points in student.test_points:
+                if test_points.points is not None:
+                    progress.add(ImportAction.moodle_test_grades)
+                if any(True for file in test_points.files):
+                    progress.add(ImportAction.moodle_test_details)
+
+            for grade in student.grades:
+                if grade.grade is not None:
+                    progress.add(ImportAction.grades)
+                if grade.points is not None:
+                    progress.add(ImportAction.moodle_final_exam_grades)
+                if any(True for file in grade.files):
+                    progress.add(ImportAction.moodle_final_exam_details)
+
+        return progress
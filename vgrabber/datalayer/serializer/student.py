@@ -86,5 +86,7 @@ class StudentSerializer:
                 path=file.file_path,
                 filename=file.file_name
             )
+            if file.file_hash is not None:
+                file_element.attrib['hash'] = file.file_hash
 
             parent_element.append(file_element)
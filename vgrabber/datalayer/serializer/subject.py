@@ -1,7 +1,9 @@
-from lxml.etree import Element
+from lxml.etree import Element, indent, xmlfile
 
 from vgrabber.model import Subject
+from .grading import GradingPolicySerializer
 from .homeworkcategory import HomeWorkCategorySerializer
+from .progress import ProgressSerializer
 from .test import TestSerializer
 from .teacher import TeacherSerializer
 from .student import StudentSerializer
@@ -11,6 +13,8 @@ from .finalexam import FinalExamSerializer
 class SubjectSerializer:
     __subject: Subject
 
+    __indentation = '  '
+
     def __init__(self, subject):
         self.__subject = subject
 
@@ -22,44 +26,78 @@ class SubjectSerializer:
             year=self.__subject.year
         )
 
-        students_element = Element('students')
+        subject_element.append(ProgressSerializer(self.__subject).serialize())
+        subject_element.append(GradingPolicySerializer(self.__subject.grading_policy).serialize())
 
-        for student in self.__subject.students:
-            student_element = StudentSerializer(student).serialize()
-            students_element.append(student_element)
+        for section_name, section_elements in self.__serialize_sections():
+            section_element = Element(section_name)
 
-        subject_element.append(students_element)
+            for element in section_elements:
+                section_element.append(element)
 
-        teachers_element = Element('teachers')
+            subject_element.append(section_element)
 
-        for teacher in self.__subject.teachers:
-            teacher_element = TeacherSerializer(teacher).serialize()
-            teachers_element.append(teacher_element)
+        return subject_element
 
-        subject_element.append(teachers_element)
+    def write(self, file):
+        # writes the same output as pretty printed serialize(), but one section item at a time
+        subject_attrib = {
+            'number': self.__subject.number,
+            'name': self.__subject.name,
+            'year': self.__subject.year,
+        }
 
-        homeworks_element = Element('homeworks')
+        with xmlfile(file, encoding='utf-8') as xf:
+            xf.write_declaration()
 
-        for home_work_category in self.__subject.home_work_categories:
-            category_element = HomeWorkCategorySerializer(home_work_category).serialize()
-            homeworks_element.append(category_element)
+            with xf.element('subject', subject_attrib):
+                self.__write_element(xf, ProgressSerializer(self.__subject).serialize(), 1)
+                self.__write_element(xf, GradingPolicySerializer(self.__subject.grading_policy).serialize(), 1)
 
-        subject_element.append(homeworks_element)
+                for section_name, section_elements in self.__serialize_sections():
+                    self.__write_section(xf, section_name, section_elements)
 
-        tests_element = Element('tests')
+                xf.write('\n')
 
-        for test in self.__subject.tests:
-            test_element = TestSerializer(test).serialize()
-            tests_element.append(test_element)
+        file.write(b'\n')
 
-        subject_element.append(tests_element)
+    def __serialize_sections(self):
+        yield 'students', (
+            StudentSerializer(student).serialize()
+                for student in self.__subject.students
+        )
+        yield 'teachers', (
+            TeacherSerializer(teacher).serialize()
+                for teacher in self.__subject.teachers
+        )
+        yield 'homeworks', (
+            HomeWorkCategorySerializer(home_work_category).serialize()
+                for home_work_category in self.__subject.home_work_categories
+        )
+        yield 'tests', (
+            TestSerializer(test).serialize()
+                for test in self.__subject.tests
+        )
+        yield 'finalexams', (
+            FinalExamSerializer(final_exam).serialize()
+                for final_exam in self.__subject.final_exams
+        )
 
-        finalexams_element = Element('finalexams')
+    def __write_section(self, xf, section_name, section_elements):
+        first_element = next(section_elements, None)
 
-        for final_exam in self.__subject.final_exams:
-            finalexam_element = FinalExamSerializer(final_exam).serialize()
-            finalexams_element.append(finalexam_element)
+        if first_element is None:
+            self.__write_element(xf, Element(section_name), 1)
+            return
 
-        subject_element.append(finalexams_element)
+        xf.write('\n' + self.__indentation)
+        with xf.element(section_name):
+            self.__write_element(xf, first_element, 2)
+            for element in section_elements:
+                self.__write_element(xf, element, 2)
+            xf.write('\n' + self.__indentation)
 
-        return subject_element
+    def __write_element(self, xf, element, level):
+        indent(element, space=self.__indentation, level=level)
+        xf.write('\n' + self.__indentation * level)
+        xf.write(element)
@@ -1,6 +1,7 @@
 from lxml.etree import Element
 
 from vgrabber.model import Test
+from vgrabber.utilities.number import format_number
 
 
 class TestSerializer:
@@ -17,4 +18,7 @@ class TestSerializer:
             moodleid=str(self.__test.moodle_id)
         )
 
+        if self.__test.weight is not None:
+            test_element.attrib['weight'] = format_number(self.__test.weight)
+
         return test_element
@@ -0,0 +1,102 @@
+import datetime
+import hashlib
+import logging
+import pickle
+from typing import Optional
+
+from vgrabber.base.importaction import ImportAction
+from vgrabber.model import Subject, Student, Teacher, Group, HomeWork, HomeWorkCategory, Test, FinalExam, Grade, \
+    StudentGrade, HomeWorkPoints, TestPoints, GradingPolicy
+from vgrabber.model.files import FileList, StoredFile
+from .fileaccessors import FileAccessor
+from .serializer import ProgressSerializer
+
+
+class HashingWriter:
+    def __init__(self, file):
+        self.__file = file
+        self.__hash = hashlib.sha256()
+
+    def write(self, data):
+        self.__hash.update(data)
+        return self.__file.write(data)
+
+    def hexdigest(self):
+        return self.__hash.hexdigest()
+
+
+class SnapshotUnpickler(pickle.Unpickler):
+    # exactly the classes a saved subject consists of, nothing is imported by name
+    __allowed_classes = {
+        (cls.__module__, cls.__qualname__): cls
+            for cls in (
+                Subject, Student, Teacher, Group, HomeWork, HomeWorkCategory, Test, FinalExam, Grade, StudentGrade,
+                HomeWorkPoints, TestPoints, GradingPolicy, FileList, StoredFile, ImportAction, datetime.datetime
+            )
+    }
+
+    def find_class(self, module, name):
+        cls = self.__allowed_classes.get((module, name))
+        if cls is None:
+            raise pickle.UnpicklingError("{0}.{1} is not allowed in a subject snapshot".format(module, name))
+        return cls
+
+
+class SubjectSnapshot:
+    file_accessor: FileAccessor
+
+    SNAPSHOT_NAME = 'subjectinfo.snapshot'
+
+    # bump whenever the pickled shape of the model classes changes
+    VERSION = 10
+
+    __MAGIC = b'VGSNAPSHOT\n'
+    __CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, file_accessor, xml_name):
+        self.file_accessor = file_accessor
+        self.__xml_name = xml_name
+
+    def load(self) -> Optional[Subject]:
+        snapshot_stats = self.file_accessor.get_file_stats(self.SNAPSHOT_NAME)
+        xml_stats = self.file_accessor.get_file_stats(self.__xml_name)
+        if snapshot_stats is None or xml_stats is None:
+            return None
+
+        try:
+            with self.file_accessor.open_file(self.SNAPSHOT_NAME, 'r') as f:
+                if f.read(len(self.__MAGIC)) != self.__MAGIC:
+                    return None
+
+                version, xml_size, xml_mtime, xml_hash = SnapshotUnpickler(f).load()
+                if version != self.VERSION or (xml_size, xml_mtime) != xml_stats:
+                    return None
+
+                if xml_hash != self.__hash_xml():
+                    return None
+
+                subject, progress = SnapshotUnpickler(f).load()
+                subject.progress = progress
+                return subject
+        except Exception:
+            logging.exception("Subject snapshot could not be loaded, falling back to XML")
+            return None
+
+    def save(self, subject: Subject, xml_hash: str):
+        xml_size, xml_mtime = self.file_accessor.get_file_stats(self.__xml_name)
+
+        with self.file_accessor.open_file(self.SNAPSHOT_NAME, 'w') as f:
+            f.write(self.__MAGIC)
+            pickle.dump((self.VERSION, xml_size, xml_mtime, xml_hash), f, pickle.HIGHEST_PROTOCOL)
+            # the model keeps values in the types the XML is read back with, only the progress is derived
+            progress = ProgressSerializer(subject).find_out_progress()
+            pickle.dump((subject, progress), f, pickle.HIGHEST_PROTOCOL)
+
+    def __hash_xml(self):
+        xml_hash = hashlib.sha256()
+
+        with self.file_accessor.open_file(self.__xml_name, 'r') as f:
+            for chunk in iter(lambda: f.read(self.__CHUNK_SIZE), b''):
+                xml_hash.update(chunk)
+
+        return xml_hash.hexdigest()
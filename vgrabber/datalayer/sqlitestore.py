@@ -0,0 +1,400 @@
+import datetime
+import sqlite3
+from contextlib import contextmanager
+from itertools import groupby
+
+from vgrabber.base.importaction import ImportAction
+from vgrabber.model import Subject, FinalExam, Test, HomeWorkCategory, HomeWork, Teacher, Group, Student
+from vgrabber.model.files import StoredFile
+from .deserializer.context import DeserializationContext
+from .deserializer.student import StudentDeserializer, StudentItem
+from .serializer import ProgressSerializer
+
+
+class SqliteSubjectStore:
+    __schema = '''
+        CREATE TABLE IF NOT EXISTS subject (
+            number TEXT NOT NULL,
+            name TEXT NOT NULL,
+            year TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS progress (
+            action TEXT PRIMARY KEY
+        );
+        CREATE TABLE IF NOT EXISTS grading_policy (
+            minimum_points REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS final_exams (
+            position INTEGER PRIMARY KEY,
+            id INTEGER NOT NULL,
+            date_time TEXT NOT NULL,
+            room TEXT,
+            moodle_id INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS tests (
+            position INTEGER PRIMARY KEY,
+            id INTEGER NOT NULL,
+            name TEXT,
+            moodle_id INTEGER,
+            weight REAL
+        );
+        CREATE TABLE IF NOT EXISTS home_work_categories (
+            position INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            max_points REAL
+        );
+        CREATE TABLE IF NOT EXISTS home_works (
+            position INTEGER PRIMARY KEY,
+            category INTEGER NOT NULL REFERENCES home_work_categories (position),
+            id INTEGER NOT NULL,
+            name TEXT,
+            moodle_id INTEGER,
+            required_points REAL
+        );
+        CREATE TABLE IF NOT EXISTS teachers (
+            position INTEGER PRIMARY KEY,
+            name TEXT,
+            surname TEXT,
+            moodle_id INTEGER,
+            moodle_email TEXT
+        );
+        CREATE TABLE IF NOT EXISTS groups (
+            position INTEGER PRIMARY KEY,
+            teacher INTEGER NOT NULL REFERENCES teachers (position),
+            number TEXT,
+            moodle_id INTEGER,
+            moodle_name TEXT
+        );
+        CREATE TABLE IF NOT EXISTS students (
+            position INTEGER PRIMARY KEY,
+            number TEXT,
+            name TEXT NOT NULL,
+            surname TEXT NOT NULL,
+            "group" TEXT,
+            moodle_id INTEGER,
+            moodle_group_id INTEGER,
+            moodle_email TEXT
+        );
+        CREATE TABLE IF NOT EXISTS student_items (
+            position INTEGER PRIMARY KEY,
+            student INTEGER NOT NULL REFERENCES students (position),
+            tag TEXT NOT NULL,
+            item_id INTEGER NOT NULL,
+            points REAL,
+            grade TEXT
+        );
+        CREATE INDEX IF NOT EXISTS student_items_student ON student_items (student);
+        CREATE TABLE IF NOT EXISTS student_item_files (
+            position INTEGER PRIMARY KEY,
+            item INTEGER NOT NULL REFERENCES student_items (position),
+            file_name TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            file_hash TEXT
+        );
+        CREATE INDEX IF NOT EXISTS student_item_files_item ON student_item_files (item);
+    '''
+
+    __tables = (
+        'student_item_files', 'student_items', 'students', 'groups', 'teachers',
+        'home_works', 'home_work_categories', 'tests', 'final_exams', 'grading_policy', 'progress',
+        'subject',
+    )
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.__connection = connection
+        # executescript commits implicitly, so the schema is set up once when the database is opened, not per save
+        self.__connection.executescript(self.__schema)
+        self.__upgrade_schema()
+        self.__connection.commit()
+
+    @contextmanager
+    def transaction(self):
+        # the content store files written through the same connection are committed together with the rows
+        self.__connection.execute('BEGIN')
+        with self.__connection:
+            yield
+
+    def load(self) -> Subject:
+        row = self.__connection.execute('SELECT number, name, year FROM subject').fetchone()
+        if row is None:
+            raise Exception("The database does not contain any subject")
+
+        subject = Subject(*row)
+        context = DeserializationContext(subject)
+
+        for action, in self.__connection.execute('SELECT action FROM progress'):
+            if action in ImportAction.__members__:
+                subject.finish_action(ImportAction[action])
+
+        self.__load_grading_policy(context)
+        self.__load_final_exams(context)
+        self.__load_tests(context)
+        self.__load_home_works(context)
+        self.__load_students(context)
+        self.__load_teachers(context)
+
+        return subject
+
+    def save(self, subject: Subject):
+        for table in self.__tables:
+            self.__connection.execute('DELETE FROM {0}'.format(table))
+
+        self.__connection.execute(
+            'INSERT INTO subject (number, name, year) VALUES (?, ?, ?)',
+            (subject.number, subject.name, subject.year)
+        )
+
+        self.__save_progress(subject)
+        self.__save_grading_policy(subject)
+        self.__save_final_exams(subject)
+        self.__save_tests(subject)
+        self.__save_home_works(subject)
+        self.__save_students(subject)
+        self.__save_teachers(subject)
+
+    def save_changes(self, subject: Subject):
+        if subject.has_structure_changes:
+            self.save(subject)
+            return
+
+        positions = {student: position for position, student in enumerate(subject.students)}
+        changed_positions = [positions[student] for student in subject.changed_students if student in positions]
+
+        # points or files of a student can finish an import action
+        self.__connection.execute('DELETE FROM progress')
+        self.__save_progress(subject)
+
+        self.__connection.executemany(
+            'DELETE FROM student_item_files WHERE item IN (SELECT position FROM student_items WHERE student = ?)',
+            ((position,) for position in changed_positions)
+        )
+        self.__connection.executemany(
+            'DELETE FROM student_items WHERE student = ?',
+            ((position,) for position in changed_positions)
+        )
+        self.__connection.executemany(
+            'DELETE FROM students WHERE position = ?',
+            ((position,) for position in changed_positions)
+        )
+
+        first_item_position, = self.__connection.execute(
+            'SELECT coalesce(max(position), -1) + 1 FROM student_items'
+        ).fetchone()
+
+        self.__insert_students(
+            ((position, subject.students[position]) for position in changed_positions),
+            first_item_position
+        )
+
+    def __upgrade_schema(self):
+        file_columns = {row[1] for row in self.__connection.execute('PRAGMA table_info(student_item_files)')}
+        if 'file_hash' not in file_columns:
+            self.__connection.execute('ALTER TABLE student_item_files ADD COLUMN file_hash TEXT')
+        test_columns = {row[1] for row in self.__connection.execute('PRAGMA table_info(tests)')}
+        if 'weight' not in test_columns:
+            self.__connection.execute('ALTER TABLE tests ADD COLUMN weight REAL')
+
+    def __save_progress(self, subject):
+        self.__connection.executemany(
+            'INSERT INTO progress (action) VALUES (?)',
+            ((action.name,) for action in ProgressSerializer(subject).find_out_progress())
+        )
+
+    def __load_grading_policy(self, context):
+        row = self.__connection.execute('SELECT minimum_points FROM grading_policy').fetchone()
+        if row is not None:
+            context.subject.grading_policy.minimum_points, = row
+
+    def __save_grading_policy(self, subject):
+        self.__connection.execute(
+            'INSERT INTO grading_policy (minimum_points) VALUES (?)',
+            (subject.grading_policy.minimum_points,)
+        )
+
+    def __load_final_exams(self, context):
+        for id, date_time, room, moodle_id in self.__connection.execute(
+                'SELECT id, date_time, room, moodle_id FROM final_exams ORDER BY position'):
+            final_exam = FinalExam(context.subject, datetime.datetime.fromisoformat(date_time), room, id)
+            final_exam.moodle_id = moodle_id
+            context.add_final_exam(final_exam)
+
+    def __save_final_exams(self, subject):
+        self.__connection.executemany(
+            'INSERT INTO final_exams (position, id, date_time, room, moodle_id) VALUES (?, ?, ?, ?, ?)',
+            (
+                (position, final_exam.id, final_exam.date_time.isoformat(), final_exam.room, final_exam.moodle_id)
+                    for position, final_exam in enumerate(subject.final_exams)
+            )
+        )
+
+    def __load_tests(self, context):
+        for id, name, moodle_id, weight in self.__connection.execute(
+                'SELECT id, name, moodle_id, weight FROM tests ORDER BY position'):
+            test = Test(context.subject, id, name, moodle_id)
+            test.weight = weight
+            context.add_test(test)
+
+    def __save_tests(self, subject):
+        self.__connection.executemany(
+            'INSERT INTO tests (position, id, name, moodle_id, weight) VALUES (?, ?, ?, ?, ?)',
+            (
+                (position, test.id, test.name, test.moodle_id, test.weight)
+                    for position, test in enumerate(subject.tests)
+            )
+        )
+
+    def __load_home_works(self, context):
+        home_works = self.__connection.execute(
+            'SELECT category, id, name, moodle_id, required_points FROM home_works ORDER BY category, position'
+        )
+        home_works_by_category = {
+            category: list(rows)
+                for category, rows in groupby(home_works, key=lambda row: row[0])
+        }
+
+        for position, name, max_points in self.__connection.execute(
+                'SELECT position, name, max_points FROM home_work_categories ORDER BY position'):
+            home_work_category = HomeWorkCategory(context.subject, name)
+            home_work_category.max_points = max_points
+
+            for category, id, name, moodle_id, required_points in home_works_by_category.get(position, ()):
+                home_work = HomeWork(context.subject, id, name, moodle_id)
+                home_work.required_points = required_points
+                home_work_category.add_home_work(home_work)
+
+            context.add_home_work_category(home_work_category)
+
+    def __save_home_works(self, subject):
+        self.__connection.executemany(
+            'INSERT INTO home_work_categories (position, name, max_points) VALUES (?, ?, ?)',
+            (
+                (position, home_work_category.name, home_work_category.max_points)
+                    for position, home_work_category in enumerate(subject.home_work_categories)
+            )
+        )
+        self.__connection.executemany(
+            'INSERT INTO home_works (category, id, name, moodle_id, required_points) VALUES (?, ?, ?, ?, ?)',
+            (
+                (position, home_work.id, home_work.name, home_work.moodle_id, home_work.required_points)
+                    for position, home_work_category in enumerate(subject.home_work_categories)
+                        for home_work in home_work_category.home_works
+            )
+        )
+
+    def __load_teachers(self, context):
+        groups = self.__connection.execute(
+            'SELECT teacher, number, moodle_id, moodle_name FROM groups ORDER BY teacher, position'
+        )
+        groups_by_teacher = {
+            teacher: list(rows)
+                for teacher, rows in groupby(groups, key=lambda row: row[0])
+        }
+
+        for position, name, surname, moodle_id, moodle_email in self.__connection.execute(
+                'SELECT position, name, surname, moodle_id, moodle_email FROM teachers ORDER BY position'):
+            teacher = Teacher(context.subject, name, surname, moodle_id, moodle_email)
+
+            for teacher_position, number, group_moodle_id, moodle_name in groups_by_teacher.get(position, ()):
+                teacher.add_taught_group(Group(context.subject, number, group_moodle_id, moodle_name))
+
+            context.subject.add_teacher(teacher)
+
+    def __save_teachers(self, subject):
+        self.__connection.executemany(
+            'INSERT INTO teachers (position, name, surname, moodle_id, moodle_email) VALUES (?, ?, ?, ?, ?)',
+            (
+                (position, teacher.name, teacher.surname, teacher.moodle_id, teacher.moodle_email)
+                    for position, teacher in enumerate(subject.teachers)
+            )
+        )
+        self.__connection.executemany(
+            'INSERT INTO groups (teacher, number, moodle_id, moodle_name) VALUES (?, ?, ?, ?)',
+            (
+                (position, group.number, group.moodle_id, group.moodle_name)
+                    for position, teacher in enumerate(subject.teachers)
+                        for group in teacher.taught_groups
+            )
+        )
+
+    def __load_students(self, context):
+        files = self.__connection.execute(
+            'SELECT item, file_name, file_path, file_hash FROM student_item_files ORDER BY item, position'
+        )
+        files_by_item = {
+            item: [StoredFile(file_name, file_path, file_hash) for item, file_name, file_path, file_hash in rows]
+                for item, rows in groupby(files, key=lambda row: row[0])
+        }
+
+        items = self.__connection.execute(
+            'SELECT student, position, tag, item_id, points, grade FROM student_items ORDER BY student, position'
+        )
+        items_by_student = {
+            student: [
+                StudentItem(tag, item_id, points, grade, files_by_item.get(position, []))
+                    for student, position, tag, item_id, points, grade in rows
+            ]
+                for student, rows in groupby(items, key=lambda row: row[0])
+        }
+
+        items_deserializer = StudentDeserializer(context, None)
+
+        for position, number, name, surname, group, moodle_id, moodle_group_id, moodle_email in \
+                self.__connection.execute(
+                    'SELECT position, number, name, surname, "group", moodle_id, moodle_group_id, moodle_email '
+                    'FROM students ORDER BY position'):
+            student = Student(context.subject, number, name, surname, group)
+            student.moodle_id = moodle_id
+            student.moodle_group_id = moodle_group_id
+            student.moodle_email = moodle_email
+
+            items_deserializer.deserialize_items(student, items_by_student.get(position, ()))
+
+            context.subject.add_student(student)
+
+    def __save_students(self, subject):
+        self.__insert_students(enumerate(subject.students), 0)
+
+    def __insert_students(self, students, first_item_position):
+        students = list(students)
+
+        self.__connection.executemany(
+            'INSERT INTO students (position, number, name, surname, "group", moodle_id, moodle_group_id, moodle_email) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                (position, student.number, student.name, student.surname, student.group,
+                 student.moodle_id, student.moodle_group_id, student.moodle_email)
+                    for position, student in students
+            )
+        )
+
+        items = []
+        files = []
+
+        for position, student in students:
+            for tag, item_id, points, grade, item_files in self.__get_student_items(student):
+                item_position = first_item_position + len(items)
+                items.append((item_position, position, tag, item_id, points, grade))
+                for file in item_files:
+                    files.append((item_position, file.file_name, file.file_path, file.file_hash))
+
+        self.__connection.executemany(
+            'INSERT INTO student_items (position, student, tag, item_id, points, grade) VALUES (?, ?, ?, ?, ?, ?)',
+            items
+        )
+        self.__connection.executemany(
+            'INSERT INTO student_item_files (item, file_name, file_path, file_hash) VALUES (?, ?, ?, ?)',
+            files
+        )
+
+    def __get_student_items(self, student):
+        for home_work_points in student.home_work_points:
+            yield 'homework', home_work_points.home_work.id, home_work_points.points, None, home_work_points.files
+
+        for test_points in student.test_points:
+            yield 'test', test_points.test.id, test_points.points, None, test_points.files
+
+        for grade in student.grades:
+            grade_name = None
+            if grade.grade is not None:
+                grade_name = grade.grade.name
+            yield 'finalexam', grade.final_exam.id, grade.points, grade_name, grade.files
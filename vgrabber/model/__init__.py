@@ -8,3 +8,4 @@ from .homework import HomeWork, HomeWorkCategory
 from .group import Group
 from .homeworkpoints import HomeWorkPoints
 from .testpoints import TestPoints
+from .grading import GradingPolicy, SemestralGrader, SemestralGrading
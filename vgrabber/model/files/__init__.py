@@ -1,4 +1,5 @@
-from .inmemory import InMemoryFile
+from .memorybudget import MemoryBudget
+from .spooled import SpooledFile
 from .stored import StoredFile
 from .external import ExternalFile
 from .filelist import FileList
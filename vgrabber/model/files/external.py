@@ -5,6 +5,8 @@ class ExternalFile:
     file_name: str
     file_path: str
 
+    __slots__ = ('file_name', 'file_path')
+
     def __init__(self, file_path):
         self.file_name = os.path.basename(file_path)
         self.file_path = file_path
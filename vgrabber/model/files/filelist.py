@@ -1,5 +1,8 @@
 class FileList:
-    def __init__(self):
+    __slots__ = ('__owner', 'files')
+
+    def __init__(self, owner):
+        self.__owner = owner
         self.files = []
 
     def __iter__(self):
@@ -7,9 +10,12 @@ class FileList:
 
     def clear(self):
         self.files.clear()
+        self.__owner.mark_changed()
 
     def add_file(self, file):
         self.files.append(file)
+        self.__owner.mark_changed()
 
     def replace(self, new_files):
         self.files = list(new_files)
+        self.__owner.mark_changed()
@@ -0,0 +1,25 @@
+from threading import Lock
+
+
+class MemoryBudget:
+    size: int
+
+    def __init__(self, size):
+        self.size = size
+        self.__used = 0
+        self.__lock = Lock()
+
+    @property
+    def used(self):
+        return self.__used
+
+    def reserve(self, size):
+        with self.__lock:
+            if self.__used + size > self.size:
+                return False
+            self.__used += size
+            return True
+
+    def release(self, size):
+        with self.__lock:
+            self.__used -= size
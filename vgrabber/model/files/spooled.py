@@ -0,0 +1,99 @@
+import hashlib
+import os
+import weakref
+from io import BytesIO
+from tempfile import mkstemp
+from typing import BinaryIO, Iterable, Optional, Union
+
+from .memorybudget import MemoryBudget
+
+
+def _release_spooled_data(memory_budget, size, spool_path):
+    if spool_path is None:
+        memory_budget.release(size)
+    else:
+        try:
+            os.remove(spool_path)
+        except OSError:
+            pass
+
+
+class SpooledFile:
+    file_name: str
+    file_hash: str
+    size: int
+    spool_path: Optional[str]
+    memory_budget: MemoryBudget
+
+    __slots__ = ('file_name', 'file_hash', 'size', 'spool_path', 'memory_budget', '__data', '__weakref__')
+
+    MAX_IN_MEMORY_SIZE = 1024 * 1024
+
+    # shared by all downloaded files which have not been saved yet
+    default_memory_budget = MemoryBudget(256 * 1024 * 1024)
+
+    def __init__(self, file_name, data: Union[bytes, Iterable[bytes]], memory_budget: Optional[MemoryBudget] = None):
+        if memory_budget is None:
+            memory_budget = self.default_memory_budget
+
+        self.memory_budget = memory_budget
+
+        if isinstance(data, bytes):
+            data = (data, )
+
+        self.file_name = file_name
+        self.size = 0
+        self.spool_path = None
+        self.__data = None
+
+        file_hash = hashlib.sha256()
+        chunks = []
+        spool_file = None
+
+        try:
+            for chunk in data:
+                file_hash.update(chunk)
+                self.size += len(chunk)
+
+                if spool_file is not None:
+                    spool_file.write(chunk)
+                    continue
+
+                chunks.append(chunk)
+
+                if self.size > self.MAX_IN_MEMORY_SIZE:
+                    spool_file = self.__spill(chunks)
+
+            if spool_file is None:
+                data = chunks[0] if len(chunks) == 1 else b''.join(chunks)
+                if self.memory_budget.reserve(self.size):
+                    self.__data = data
+                else:
+                    spool_file = self.__spill((data, ))
+        except BaseException:
+            if spool_file is not None:
+                spool_file.close()
+                os.remove(self.spool_path)
+            raise
+
+        if spool_file is not None:
+            spool_file.close()
+
+        self.file_hash = file_hash.hexdigest()
+
+        weakref.finalize(self, _release_spooled_data, self.memory_budget, self.size, self.spool_path)
+
+    def open(self) -> BinaryIO:
+        if self.spool_path is None:
+            return BytesIO(self.__data)
+        else:
+            return open(self.spool_path, 'rb')
+
+    def __spill(self, chunks):
+        fd, self.spool_path = mkstemp(prefix='vgrabber-', suffix='.spool')
+        ret = os.fdopen(fd, 'wb')
+
+        for chunk in chunks:
+            ret.write(chunk)
+
+        return ret
@@ -1,7 +1,14 @@
+from typing import Optional
+
+
 class StoredFile:
     file_name: str
     file_path: str
+    file_hash: Optional[str]
+
+    __slots__ = ('file_name', 'file_path', 'file_hash')
 
-    def __init__(self, file_name, file_path):
+    def __init__(self, file_name, file_path, file_hash=None):
         self.file_name = file_name
         self.file_path = file_path
+        self.file_hash = file_hash
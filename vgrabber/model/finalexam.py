@@ -7,18 +7,25 @@ class FinalExam:
     id: int
     moodle_id: int
 
+    __slots__ = ('__subject', 'date_time', 'room', 'id', '__moodle_id')
+
     def __init__(self, subject, date_time, room, id):
         self.__subject = subject
         self.date_time = date_time
         self.room = room
         self.id = id
-        self.moodle_id = None
+        self.__moodle_id = None
+
+    @property
+    def moodle_id(self):
+        return self.__moodle_id
+
+    @moodle_id.setter
+    def moodle_id(self, value):
+        self.__moodle_id = None if value is None else int(value)
 
     def __str__(self):
         return "<FinalExam {0} at {1} in room {2}>".format(self.id, self.date_time.isoformat(), self.room)
 
     def get_submissions(self):
-        for student in self.__subject.students:
-            for grade in student.grades:
-                if grade.final_exam is self:
-                    yield grade
+        return self.__subject.get_submissions(self)
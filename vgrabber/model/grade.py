@@ -19,17 +19,44 @@ class StudentGrade:
     points: float
     files: FileList
 
+    __slots__ = ('__subject', 'final_exam', '__grade', '__points', 'files', 'student')
+
     def __init__(self, subject, student, final_exam, grade):
         self.__subject = subject
         self.final_exam = final_exam
-        self.grade = grade
-        self.points = None
-        self.files = FileList()
+        self.__grade = grade
+        self.__points = None
+        self.files = FileList(self)
 
         self.student = student
 
+    @property
+    def grade(self):
+        return self.__grade
+
+    @grade.setter
+    def grade(self, value):
+        self.__grade = value
+        self.mark_changed()
+
+    @property
+    def item(self):
+        return self.final_exam
+
+    @property
+    def points(self):
+        return self.__points
+
+    @points.setter
+    def points(self, value):
+        self.__points = None if value is None else float(value)
+        self.mark_changed()
+
     def __str__(self):
         return "<Grade {0} for final exam at {1}>".format(self.grade.name, self.final_exam.date_time.isoformat())
 
     def clear_files(self):
         self.files.clear()
+
+    def mark_changed(self):
+        self.student.mark_changed()
@@ -0,0 +1,126 @@
+from typing import Dict, Optional
+
+from .homework import HomeWork, HomeWorkCategory
+
+
+class SemestralGrading:
+    test_points: float
+    category_points: Dict[HomeWorkCategory, float]
+    failed_home_work: Optional[HomeWork]
+    minimum_points: float
+
+    __slots__ = ('test_points', 'category_points', 'failed_home_work', 'minimum_points')
+
+    def __init__(self, test_points, category_points, failed_home_work, minimum_points):
+        self.test_points = test_points
+        self.category_points = category_points
+        self.failed_home_work = failed_home_work
+        self.minimum_points = minimum_points
+
+    @property
+    def total_points(self):
+        return self.test_points + sum(self.category_points.values())
+
+    @property
+    def points(self):
+        if self.failed_home_work is not None:
+            return 0
+
+        total_points = self.total_points
+        if total_points < self.minimum_points:
+            return 0
+        return total_points
+
+
+class GradingPolicy:
+    minimum_points: float
+
+    __slots__ = ('__subject', '__minimum_points')
+
+    DEFAULT_MINIMUM_POINTS = 25
+
+    def __init__(self, subject):
+        self.__subject = subject
+        self.__minimum_points = float(self.DEFAULT_MINIMUM_POINTS)
+
+    @property
+    def minimum_points(self):
+        return self.__minimum_points
+
+    @minimum_points.setter
+    def minimum_points(self, value):
+        self.__minimum_points = float(value)
+        self.__subject.grading_rules_changed()
+        self.__subject.mark_changed()
+
+
+class SemestralGrader:
+    def __init__(self, subject):
+        # the rules are the same for every student, the subject keeps the grader until they change
+        self.__required_points = [
+            (home_work, home_work.required_points)
+                for category in subject.home_work_categories
+                    for home_work in category.home_works
+                        if home_work.required_points is not None
+        ]
+        self.__max_points = {
+            category: category.max_points
+                for category in subject.home_work_categories
+                    if category.max_points is not None
+        }
+        self.__test_weights = {
+            test: test.weight
+                for test in subject.tests
+                    if test.weight is not None
+        }
+        self.__minimum_points = subject.grading_policy.minimum_points
+
+    def grade(self, student) -> SemestralGrading:
+        return self.grade_all((student,))[student]
+
+    def grade_all(self, students) -> Dict[object, SemestralGrading]:
+        # the rules are looked up once for the whole batch, each student's records are walked once
+        required_points = self.__required_points
+        required_home_works = {home_work for home_work, points in required_points}
+        max_points = self.__max_points
+        test_weights = self.__test_weights
+        minimum_points = self.__minimum_points
+
+        gradings = {}
+        for student in students:
+            test_points = 0
+            for record in student.test_points:
+                points = record.points
+                if points is not None:
+                    weight = test_weights.get(record.test)
+                    if weight is not None:
+                        points *= weight
+                    test_points += points
+
+            category_points = {}
+            # only the first record of a home work counts for its required points, like get_points_for
+            required_home_work_points = {}
+            for record in student.home_work_points:
+                home_work = record.home_work
+                points = record.points
+                if home_work in required_home_works:
+                    required_home_work_points.setdefault(home_work, points)
+                if points is not None:
+                    category = home_work.category
+                    category_points[category] = category_points.get(category, 0) + points
+
+            for category, points in category_points.items():
+                category_max_points = max_points.get(category)
+                if category_max_points is not None and points > category_max_points:
+                    category_points[category] = category_max_points
+
+            failed_home_work = None
+            for home_work, home_work_required_points in required_points:
+                points = required_home_work_points.get(home_work)
+                if points is None or points < home_work_required_points:
+                    failed_home_work = home_work
+                    break
+
+            gradings[student] = SemestralGrading(test_points, category_points, failed_home_work, minimum_points)
+
+        return gradings
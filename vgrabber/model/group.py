@@ -3,6 +3,8 @@ class Group:
     moodle_id: int
     moodle_name: str
 
+    __slots__ = ('__subject', 'number', 'moodle_id', 'moodle_name')
+
     def __init__(self, subject, number, moodle_id, moodle_name):
         self.__subject = subject
         self.number = number
@@ -11,8 +13,6 @@ class Group:
 
     def get_students(self):
         if self.moodle_id is None:
-            return
+            return []
 
-        for student in self.__subject.students:
-            if student.moodle_group_id == self.moodle_id:
-                yield student
+        return self.__subject.get_students_by_moodle_group_id(self.moodle_id)
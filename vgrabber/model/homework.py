@@ -4,20 +4,29 @@ from typing import List, Optional
 class HomeWork:
     category: "HomeWorkCategory"
     required_points: Optional[float]
-    
+
+    __slots__ = ('__subject', 'id', 'name', 'moodle_id', 'category', '__required_points')
+
     def __init__(self, subject, id, name, moodle_id):
         self.__subject = subject
         self.id = id
         self.name = name
         self.moodle_id = moodle_id
         self.category = None
-        self.required_points = None
+        self.__required_points = None
+
+    @property
+    def required_points(self):
+        return self.__required_points
+
+    @required_points.setter
+    def required_points(self, value):
+        self.__required_points = None if value is None else float(value)
+        self.__subject.grading_rules_changed()
+        self.__subject.mark_changed()
 
     def get_submissions(self):
-        for student in self.__subject.students:
-            for home_work_points in student.home_work_points:
-                if home_work_points.home_work is self:
-                    yield home_work_points
+        return self.__subject.get_submissions(self)
 
 
 class HomeWorkCategory:
@@ -25,15 +34,31 @@ class HomeWorkCategory:
     home_works: List[HomeWork]
     max_points: Optional[float]
 
+    __slots__ = ('__subject', 'name', 'home_works', '__max_points')
+
     def __init__(self, subject, name):
         self.__subject = subject
         self.name = name
         self.home_works = []
-        self.max_points = None
+        self.__max_points = None
+
+    @property
+    def max_points(self):
+        return self.__max_points
+
+    @max_points.setter
+    def max_points(self, value):
+        self.__max_points = None if value is None else float(value)
+        self.__subject.grading_rules_changed()
+        self.__subject.mark_changed()
 
     def clear_home_works(self):
         self.home_works.clear()
+        self.__subject.home_works_removed(self)
+        self.__subject.mark_changed()
 
     def add_home_work(self, home_work):
         self.home_works.append(home_work)
         home_work.category = self
+        self.__subject.home_work_added(self, home_work)
+        self.__subject.mark_changed()
@@ -7,13 +7,31 @@ class HomeWorkPoints:
     points: float
     files: FileList
 
+    __slots__ = ('__subject', 'home_work', '__points', 'files', 'student')
+
     def __init__(self, subject, student, home_work, points):
         self.__subject = subject
         self.home_work = home_work
-        self.points = points
-        self.files = FileList()
+        self.__points = None if points is None else float(points)
+        self.files = FileList(self)
 
         self.student = student
 
+    @property
+    def item(self):
+        return self.home_work
+
+    @property
+    def points(self):
+        return self.__points
+
+    @points.setter
+    def points(self, value):
+        self.__points = None if value is None else float(value)
+        self.student.mark_points_changed()
+
     def clear_files(self):
         self.files.clear()
+
+    def mark_changed(self):
+        self.student.mark_changed()
@@ -15,12 +15,15 @@ class Student:
     surname: str
     group: str
     grades: List[StudentGrade]
-    moodle_id: int
-    moodle_group_id: int
-    moodle_email: str
     home_work_points: List[HomeWorkPoints]
     test_points: List[TestPoints]
 
+    __slots__ = (
+        '__subject', 'number', 'name', 'surname', 'group', 'grades', '__moodle_id', '__moodle_group_id',
+        '__moodle_email', 'home_work_points', 'test_points', '__grades_by_final_exam', '__points_by_home_work',
+        '__points_by_test'
+    )
+
     def __init__(self, subject, number, name, surname, group):
         self.__subject = subject
         self.number = number
@@ -28,11 +31,15 @@ class Student:
         self.surname = surname
         self.group = group
         self.grades = []
-        self.moodle_id = None
-        self.moodle_group_id = None
-        self.moodle_email = None
+        self.__moodle_id = None
+        self.__moodle_group_id = None
+        self.__moodle_email = None
         self.home_work_points = []
         self.test_points = []
+        # the first record of each item, the lists keep all of them in order
+        self.__grades_by_final_exam = {}
+        self.__points_by_home_work = {}
+        self.__points_by_test = {}
 
     def __str__(self):
         graded = ""
@@ -46,67 +53,115 @@ class Student:
             graded
         )
 
+    @property
+    def moodle_id(self):
+        return self.__moodle_id
+
+    @moodle_id.setter
+    def moodle_id(self, value):
+        old_moodle_id = self.__moodle_id
+        self.__moodle_id = None if value is None else int(value)
+        self.__subject.student_moodle_id_changed(self, old_moodle_id)
+
+    @property
+    def moodle_group_id(self):
+        return self.__moodle_group_id
+
+    @moodle_group_id.setter
+    def moodle_group_id(self, value):
+        old_moodle_group_id = self.__moodle_group_id
+        self.__moodle_group_id = None if value is None else int(value)
+        self.__subject.student_moodle_group_id_changed(self, old_moodle_group_id)
+
+    @property
+    def moodle_email(self):
+        return self.__moodle_email
+
+    @moodle_email.setter
+    def moodle_email(self, value):
+        old_moodle_email = self.__moodle_email
+        self.__moodle_email = value
+        self.__subject.student_moodle_email_changed(self, old_moodle_email)
+
+    def mark_changed(self):
+        self.__subject.mark_student_changed(self)
+
+    def mark_points_changed(self):
+        self.__subject.student_points_changed(self)
+        self.mark_changed()
+
     def add_grade(self, grade):
-        self.grades.append(grade)
+        self.__add_grade(grade)
+        self.mark_changed()
 
     def add_test_points(self, test, points):
-        self.test_points.append(TestPoints(self.__subject, self, test, points))
+        self.__add_test_points(TestPoints(self.__subject, self, test, points))
+        self.mark_points_changed()
 
     def add_home_work_points(self, home_work, points):
-        self.home_work_points.append(HomeWorkPoints(self.__subject, self, home_work, points))
+        self.__add_home_work_points(HomeWorkPoints(self.__subject, self, home_work, points))
+        self.mark_points_changed()
 
     def add_final_exam_points(self, final_exam, points):
-        for grade in self.grades:
-            if grade.final_exam == final_exam:
-                grade.points = points
-                break
-        else:
+        grade = self.__grades_by_final_exam.get(final_exam)
+        if grade is None:
             grade = StudentGrade(self.__subject, self, final_exam, None)
             grade.points = points
-            self.grades.append(grade)
+            self.__add_grade(grade)
+        else:
+            grade.points = points
 
     def add_final_exam_file(self, final_exam, file):
-        for grade in self.grades:
-            if grade.final_exam == final_exam:
-                grade.files.add_file(file)
-                break
-        else:
+        grade = self.__grades_by_final_exam.get(final_exam)
+        if grade is None:
             grade = StudentGrade(self.__subject, self, final_exam, None)
             grade.files.add_file(file)
-            self.grades.append(grade)
+            self.__add_grade(grade)
+        else:
+            grade.files.add_file(file)
 
     def add_home_work_file(self, home_work, file):
-        for home_work_points in self.home_work_points:
-            if home_work_points.home_work == home_work:
-                home_work_points.files.add_file(file)
-                break
-        else:
+        home_work_points = self.__points_by_home_work.get(home_work)
+        if home_work_points is None:
             home_work_points = HomeWorkPoints(self.__subject, self, home_work, None)
             home_work_points.files.add_file(file)
-            self.home_work_points.append(home_work_points)
+            self.__add_home_work_points(home_work_points)
+        else:
+            home_work_points.files.add_file(file)
 
     def add_test_file(self, test, file):
-        for test_points in self.test_points:
-            if test_points.test == test:
-                test_points.files.add_file(file)
-                break
-        else:
+        test_points = self.__points_by_test.get(test)
+        if test_points is None:
             test_points = TestPoints(self.__subject, self, test, None)
             test_points.files.add_file(file)
-            self.test_points.append(test_points)
+            self.__add_test_points(test_points)
+        else:
+            test_points.files.add_file(file)
 
     def clear_grades(self):
+        for grade in self.grades:
+            self.__subject.remove_submission(grade)
         self.grades.clear()
+        self.__grades_by_final_exam.clear()
+        self.mark_changed()
 
     def clear_final_exam_points(self):
         for grade in self.grades:
             grade.points = None
 
     def clear_home_work_points(self):
+        for home_work_points in self.home_work_points:
+            self.__subject.remove_submission(home_work_points)
         self.home_work_points.clear()
+        self.__points_by_home_work.clear()
+        self.mark_points_changed()
 
     def clear_test_points(self):
+        for test_points in self.test_points:
+            self.__subject.remove_submission(test_points)
         self.test_points.clear()
+        self.__points_by_test.clear()
+        self.mark_points_changed()
 
     def clear_final_exam_files(self):
         for grade in self.grades:
@@ -121,47 +176,26 @@ class Student:
             test_points.clear_files()
 
     def get_moodle_group(self):
-        for teacher in self.__subject.teachers:
-            for group in teacher.taught_groups:
-                if group.moodle_id == self.moodle_group_id:
-                    return group
+        return self.__subject.get_group_by_moodle_id(self.moodle_group_id)
     
     def get_points_for(self, hw_test_or_exam):
         if isinstance(hw_test_or_exam, HomeWork):
-            for home_work_points in self.home_work_points:
-                if home_work_points.home_work is hw_test_or_exam:
-                    return home_work_points
+            return self.__points_by_home_work.get(hw_test_or_exam)
         if isinstance(hw_test_or_exam, Test):
-            for test_points in self.test_points:
-                if test_points.test is hw_test_or_exam:
-                    return test_points
+            return self.__points_by_test.get(hw_test_or_exam)
         if isinstance(hw_test_or_exam, FinalExam):
-            for grade in self.grades:
-                if grade.final_exam is hw_test_or_exam:
-                    return grade
+            return self.__grades_by_final_exam.get(hw_test_or_exam)
 
     def set_points_for(self, hw_test_or_exam, points):
-        if isinstance(hw_test_or_exam, HomeWork):
-            for home_work_points in self.home_work_points:
-                if home_work_points.home_work is hw_test_or_exam:
-                    home_work_points.points = points
-                    break
-            else:
-                self.add_home_work_points(hw_test_or_exam, points)
-        if isinstance(hw_test_or_exam, Test):
-            for test_points in self.test_points:
-                if test_points.test is hw_test_or_exam:
-                    test_points.points = points
-                    break
-            else:
-                self.add_test_points(hw_test_or_exam, points)
-        if isinstance(hw_test_or_exam, FinalExam):
-            for grade in self.grades:
-                if grade.final_exam is hw_test_or_exam:
-                    grade.points = points
-                    break
-            else:
-                self.add_final_exam_points(hw_test_or_exam, points)
+        item_points = self.get_points_for(hw_test_or_exam)
+        if item_points is not None:
+            item_points.points = points
+        elif isinstance(hw_test_or_exam, HomeWork):
+            self.add_home_work_points(hw_test_or_exam, points)
+        elif isinstance(hw_test_or_exam, Test):
+            self.add_test_points(hw_test_or_exam, points)
+        elif isinstance(hw_test_or_exam, FinalExam):
+            self.add_final_exam_points(hw_test_or_exam, points)
 
     def add_file_for(self, hw_test_or_exam, file):
         if isinstance(hw_test_or_exam, HomeWork):
@@ -171,27 +205,23 @@ class Student:
         if isinstance(hw_test_or_exam, FinalExam):
             self.add_final_exam_file(hw_test_or_exam, file)
 
+    def get_semestral_grading(self):
+        return self.__subject.get_semestral_grading(self)
+
     def compute_semestral_grading(self):
-        for category in self.__subject.home_work_categories:
-            for home_work in category.home_works:
-                if home_work.required_points is not None:
-                    points = self.get_points_for(home_work)
-                    if points is None or points.points is None or points.points < home_work.required_points:
-                        return 0
-        
-        test_points = sum(test.points for test in self.test_points if test.points is not None)
-        category_points = {}
-        
-        for home_work_points in self.home_work_points:
-            category = home_work_points.home_work.category
-            if home_work_points.points is not None:
-                category_points[category] = category_points.get(category, 0) + home_work_points.points
-        
-        for category, points in list(category_points.items()):
-            if category.max_points is not None and points > category.max_points:
-                category_points[category] = category.max_points
-        
-        total_points = test_points + sum(category_points.values())
-        if total_points < 25:  # TODO TODO TODO!!!
-            return 0
-        return total_points
+        return self.get_semestral_grading().points
+
+    def __add_grade(self, grade):
+        self.grades.append(grade)
+        self.__grades_by_final_exam.setdefault(grade.final_exam, grade)
+        self.__subject.add_submission(grade)
+
+    def __add_home_work_points(self, home_work_points):
+        self.home_work_points.append(home_work_points)
+        self.__points_by_home_work.setdefault(home_work_points.home_work, home_work_points)
+        self.__subject.add_submission(home_work_points)
+
+    def __add_test_points(self, test_points):
+        self.test_points.append(test_points)
+        self.__points_by_test.setdefault(test_points.test, test_points)
+        self.__subject.add_submission(test_points)
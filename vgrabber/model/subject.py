@@ -1,3 +1,4 @@
+from itertools import chain
 from typing import Set, List
 
 from vgrabber.base.importaction import ImportAction
@@ -7,6 +8,7 @@ from .teacher import Teacher
 from .homework import HomeWorkCategory
 from .test import Test
 from .finalexam import FinalExam
+from .grading import GradingPolicy, SemestralGrader
 
 
 class Subject:
@@ -19,6 +21,7 @@ class Subject:
     home_work_categories: List[HomeWorkCategory]
     tests: List[Test]
     final_exams: List[FinalExam]
+    grading_policy: GradingPolicy
 
     def __init__(self, number, name, year):
         self.number = number
@@ -31,27 +34,101 @@ class Subject:
         self.home_work_categories = []
         self.tests = []
         self.final_exams = []
+        self.grading_policy = GradingPolicy(self)
+        self.__changed = True
+        self.__changed_students = set()
+        self.__student_positions = {}
+        self.__students_by_moodle_group_id = {}
+        self.__groups_by_moodle_id = {}
+        self.__students_by_email = {}
+        self.__students_by_moodle_id = {}
+        self.__tests_by_id = {}
+        self.__home_works_by_id = {}
+        self.__final_exams_by_date_time = {}
+        self.__submissions = {}
+        self.__semestral_grader = None
+        self.__semestral_gradings = {}
+
+    def __getstate__(self):
+        # pickling the registry would nest the records of all students into each other, it is rebuilt instead
+        state = self.__dict__.copy()
+        del state['_Subject__submissions']
+        del state['_Subject__semestral_grader']
+        del state['_Subject__semestral_gradings']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__semestral_grader = None
+        self.__semestral_gradings = {}
+        self.__submissions = {}
+        for student in self.students:
+            for record in chain(student.grades, student.home_work_points, student.test_points):
+                self.add_submission(record)
 
     def __str__(self):
         return "<Subject {0} {1} in year {2}>".format(self.number, self.name, self.year)
 
+    @property
+    def has_changes(self):
+        return self.__changed or bool(self.__changed_students)
+
+    @property
+    def has_structure_changes(self):
+        return self.__changed
+
+    @property
+    def changed_students(self):
+        return list(self.__changed_students)
+
+    def mark_changed(self):
+        self.__changed = True
+
+    def mark_student_changed(self, student):
+        self.__changed_students.add(student)
+
+    def accept_changes(self):
+        self.__changed = False
+        self.__changed_students.clear()
+
     def finish_action(self, action):
         self.progress.add(action)
+        self.mark_changed()
 
     def add_final_exam(self, final_exam):
         self.final_exams.append(final_exam)
+        self.__final_exams_by_date_time.setdefault(final_exam.date_time, final_exam)
+        self.mark_changed()
 
     def add_student(self, student):
+        self.__student_positions[student] = len(self.students)
         self.students.append(student)
+        if student.moodle_group_id is not None:
+            self.__students_by_moodle_group_id.setdefault(student.moodle_group_id, {})[student] = None
+        if student.moodle_email is not None:
+            self.__students_by_email.setdefault(student.moodle_email, student)
+        if student.moodle_id is not None:
+            self.__students_by_moodle_id.setdefault(student.moodle_id, student)
+        self.mark_changed()
 
     def add_teacher(self, teacher):
         self.teachers.append(teacher)
+        for group in teacher.taught_groups:
+            self.__groups_by_moodle_id.setdefault(group.moodle_id, group)
+        self.mark_changed()
 
     def add_test(self, test):
         self.tests.append(test)
+        self.__tests_by_id.setdefault(test.id, test)
+        self.grading_rules_changed()
+        self.mark_changed()
 
     def add_home_work_category(self, home_work_category):
         self.home_work_categories.append(home_work_category)
+        for home_work in home_work_category.home_works:
+            self.__home_works_by_id.setdefault(home_work.id, home_work)
+        self.grading_rules_changed()
+        self.mark_changed()
 
     def add_home_work_to_category(self, home_work, category='unknown'):
         for found_category in self.home_work_categories:
@@ -62,26 +139,118 @@ class Subject:
             self.home_work_categories.append(found_category)
 
         found_category.add_home_work(home_work)
+        self.mark_changed()
 
     def clear_final_exams(self):
         self.final_exams = []
+        self.__final_exams_by_date_time.clear()
+        self.mark_changed()
 
     def clear_students(self):
         self.students.clear()
+        self.__submissions.clear()
+        self.__semestral_gradings.clear()
+        self.__student_positions.clear()
+        self.__students_by_moodle_group_id.clear()
+        self.__students_by_email.clear()
+        self.__students_by_moodle_id.clear()
+        self.mark_changed()
 
     def clear_teachers(self):
         self.teachers.clear()
+        self.__groups_by_moodle_id.clear()
+        self.mark_changed()
 
     def clear_tests(self):
         self.tests.clear()
+        self.__tests_by_id.clear()
+        self.grading_rules_changed()
+        self.mark_changed()
 
     def clear_teacher_groups(self):
         for teacher in self.teachers:
             teacher.clear_groups()
+        self.__groups_by_moodle_id.clear()
+        self.mark_changed()
 
     def clear_home_works(self):
         for category in self.home_work_categories:
             category.clear_home_works()
+        self.__home_works_by_id.clear()
+        self.grading_rules_changed()
+        self.mark_changed()
+
+    def home_work_added(self, category, home_work):
+        if category in self.home_work_categories:
+            self.__home_works_by_id.setdefault(home_work.id, home_work)
+            self.grading_rules_changed()
+
+    def home_works_removed(self, category):
+        if category in self.home_work_categories:
+            self.__home_works_by_id = {}
+            for home_work_category in self.home_work_categories:
+                for home_work in home_work_category.home_works:
+                    self.__home_works_by_id.setdefault(home_work.id, home_work)
+            self.grading_rules_changed()
+
+    def add_submission(self, record):
+        self.__submissions.setdefault(record.item, {})[record] = None
+
+    def remove_submission(self, record):
+        records = self.__submissions.get(record.item)
+        if records is not None:
+            records.pop(record, None)
+
+    def get_submissions(self, item):
+        # records are registered in import order, they are listed in the order of the students like a scan would
+        positions = self.__student_positions
+        records = [record for record in self.__submissions.get(item, ()) if record.student in positions]
+        records.sort(key=lambda record: positions[record.student])
+        return records
+
+    def group_added(self, teacher, group):
+        if teacher not in self.teachers:
+            return
+
+        other = self.__groups_by_moodle_id.get(group.moodle_id)
+        if other is None:
+            self.__groups_by_moodle_id[group.moodle_id] = group
+        elif other is not group:
+            # the group of the earlier teacher wins, the teacher the group was added to may come first
+            for found_group in self.__get_taught_groups():
+                if found_group.moodle_id == group.moodle_id:
+                    self.__groups_by_moodle_id[group.moodle_id] = found_group
+                    break
+
+    def groups_removed(self, teacher):
+        if teacher in self.teachers:
+            self.__groups_by_moodle_id = {}
+            for group in self.__get_taught_groups():
+                self.__groups_by_moodle_id.setdefault(group.moodle_id, group)
+
+    def student_moodle_group_id_changed(self, student, old_moodle_group_id):
+        if student.moodle_group_id == old_moodle_group_id or student not in self.__student_positions:
+            return
+
+        if old_moodle_group_id is not None:
+            students = self.__students_by_moodle_group_id.get(old_moodle_group_id)
+            if students is not None:
+                students.pop(student, None)
+
+        if student.moodle_group_id is not None:
+            self.__students_by_moodle_group_id.setdefault(student.moodle_group_id, {})[student] = None
+
+    def student_moodle_email_changed(self, student, old_moodle_email):
+        self.__update_student_index(
+            self.__students_by_email, student, old_moodle_email, student.moodle_email,
+            lambda other: other.moodle_email
+        )
+
+    def student_moodle_id_changed(self, student, old_moodle_id):
+        self.__update_student_index(
+            self.__students_by_moodle_id, student, old_moodle_id, student.moodle_id,
+            lambda other: other.moodle_id
+        )
 
     def clear_final_exam_points(self):
         for student in self.students:
@@ -108,30 +277,55 @@ class Subject:
             student.clear_test_files()
 
     def get_final_exam_by_date_time(self, date_time):
-        for final_exam in self.final_exams:
-            if final_exam.date_time == date_time:
-                return final_exam
+        return self.__final_exams_by_date_time.get(date_time)
 
     def get_test_by_id(self, item_id):
-        for test in self.tests:
-            if test.id == item_id:
-                return test
+        return self.__tests_by_id.get(item_id)
 
     def get_home_work_by_id(self, item_id):
-        for home_work_category in self.home_work_categories:
-            for home_work in home_work_category.home_works:
-                if home_work.id == item_id:
-                    return home_work
+        return self.__home_works_by_id.get(item_id)
 
     def get_student_by_email(self, moodle_email):
-        for student in self.students:
-            if student.moodle_email == moodle_email:
-                return student
+        return self.__students_by_email.get(moodle_email)
 
     def get_student_by_moodle_id(self, moodle_id):
-        for student in self.students:
-            if student.moodle_id == moodle_id:
-                return student
+        return self.__students_by_moodle_id.get(moodle_id)
+
+    def get_students_by_moodle_group_id(self, moodle_group_id):
+        students = self.__students_by_moodle_group_id.get(moodle_group_id, ())
+        return sorted(students, key=self.__student_positions.__getitem__)
+
+    def get_group_by_moodle_id(self, moodle_id):
+        return self.__groups_by_moodle_id.get(moodle_id)
+
+    def get_semestral_grading(self, student):
+        grading = self.__semestral_gradings.get(student)
+        if grading is None:
+            if self.__semestral_grader is None:
+                self.__semestral_grader = SemestralGrader(self)
+            grading = self.__semestral_grader.grade(student)
+            self.__semestral_gradings[student] = grading
+        return grading
+
+    def get_semestral_gradings(self, students=None):
+        if students is None:
+            students = self.students
+
+        gradings = self.__semestral_gradings
+        ungraded = [student for student in students if student not in gradings]
+        if ungraded:
+            if self.__semestral_grader is None:
+                self.__semestral_grader = SemestralGrader(self)
+            gradings.update(self.__semestral_grader.grade_all(ungraded))
+
+        return {student: gradings[student] for student in students}
+
+    def student_points_changed(self, student):
+        self.__semestral_gradings.pop(student, None)
+
+    def grading_rules_changed(self):
+        self.__semestral_grader = None
+        self.__semestral_gradings.clear()
 
     def get_teacher_by_surname(self, teacher_surname):
         teacher_surname = strip_accents(teacher_surname)
@@ -148,5 +342,27 @@ class Subject:
                 return teacher
         else:
             teacher = Teacher(self, None, None, None, None)
-            self.teachers.append(teacher)
+            self.add_teacher(teacher)
             return teacher
+
+    def __get_taught_groups(self):
+        for teacher in self.teachers:
+            yield from teacher.taught_groups
+
+    def __update_student_index(self, index, student, old_key, new_key, get_key):
+        # students which are not in the subject yet get indexed by add_student
+        if old_key == new_key or student not in self.__student_positions:
+            return
+
+        if old_key is not None and index.get(old_key) is student:
+            del index[old_key]
+            for other in self.students:
+                if get_key(other) == old_key:
+                    index[old_key] = other
+                    break
+
+        if new_key is not None:
+            # the first student in the list wins, as with a scan, whatever order the keys were set in
+            other = index.get(new_key)
+            if other is None or self.__student_positions[student] < self.__student_positions[other]:
+                index[new_key] = student
@@ -10,6 +10,8 @@ class Teacher:
     moodle_email: str
     taught_groups: List[Group]
 
+    __slots__ = ('__subject', 'name', 'surname', 'moodle_id', 'moodle_email', 'taught_groups')
+
     def __init__(self, subject, name, surname, moodle_id, moodle_email):
         self.__subject = subject
         self.name = name
@@ -20,6 +22,10 @@ class Teacher:
 
     def add_taught_group(self, group):
         self.taught_groups.append(group)
+        self.__subject.group_added(self, group)
+        self.__subject.mark_changed()
 
     def clear_groups(self):
         self.taught_groups.clear()
+        self.__subject.groups_removed(self)
+        self.__subject.mark_changed()
@@ -1,16 +1,30 @@
+from typing import Optional
+
+
 class Test:
     id: int
     name: str
     moodle_id: int
+    weight: Optional[float]
+
+    __slots__ = ('__subject', 'id', 'name', 'moodle_id', '__weight')
 
     def __init__(self, subject, id, name, moodle_id):
         self.__subject = subject
         self.id = id
         self.name = name
         self.moodle_id = moodle_id
+        self.__weight = None
+
+    @property
+    def weight(self):
+        return self.__weight
+
+    @weight.setter
+    def weight(self, value):
+        self.__weight = None if value is None else float(value)
+        self.__subject.grading_rules_changed()
+        self.__subject.mark_changed()
 
     def get_submissions(self):
-        for student in self.__subject.students:
-            for test_points in student.test_points:
-                if test_points.test is self:
-                    yield test_points
+        return self.__subject.get_submissions(self)
@@ -95,4 +95,4 @@ class EditFilesDialog:
         if self.__window.exec() == QDialog.Accepted:
             for student, file in self.__added_files:
                 student.add_file_for(self.__owner_object, file)
-            self.model.data_edited()
+            self.model.files_edited(self.__owner_object, list({student: None for student, file in self.__added_files}))
@@ -85,4 +85,4 @@ class EditPointsDialog:
         if self.__window.exec() == QDialog.Accepted:
             for student, points in self.__changes.items():
                 student.set_points_for(self.__owner_object, points)
-            self.model.data_edited()
+            self.model.points_edited(self.__owner_object, list(self.__changes))
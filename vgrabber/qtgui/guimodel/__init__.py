@@ -1 +1,2 @@
 from .model import GuiModel
+from .previewcache import PreviewCache
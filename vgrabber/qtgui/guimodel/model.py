@@ -2,43 +2,65 @@ from PyQt5.QtCore import QObject, pyqtSignal
 
 from vgrabber.datalayer import DataLayer
 from vgrabber.model import Subject
+from .previewcache import PreviewCache
 
 
 class GuiModel(QObject):
     subject: Subject
     data_layer: DataLayer
+    preview_cache: PreviewCache
 
     subject_changed = pyqtSignal()
+    # a list of students whose points or files have changed
+    students_changed = pyqtSignal(object)
+    # a home work, test or final exam and a list of students whose records of it have changed
+    points_changed = pyqtSignal(object, object)
+    files_changed = pyqtSignal(object, object)
 
     def __init__(self):
         super().__init__()
 
         self.subject = None
         self.data_layer = DataLayer()
+        # shared by the file details of all tabs
+        self.preview_cache = PreviewCache()
 
     def close(self):
         self.data_layer.close()
         self.subject = None
+        self.preview_cache.clear()
         self.subject_changed.emit()
 
     def load(self, file_accessor):
         self.subject = self.data_layer.load(file_accessor)
+        self.preview_cache.clear()
         self.subject_changed.emit()
 
-    def save_as(self, file_accessor):
-        self.data_layer.save_as(file_accessor, self.subject)
+    def save_as(self, file_accessor, progress=None):
+        self.data_layer.save_as(file_accessor, self.subject, progress)
+        # the file lists now point into another store, previews of files without a hash are keyed by the old one
+        self.preview_cache.clear()
         self.subject_changed.emit()
 
     def save(self):
         self.data_layer.save(self.subject)
         self.subject_changed.emit()
 
+    def compact(self):
+        return self.data_layer.compact(self.subject)
+
     def use_subject(self, subject):
         self.subject = subject
+        self.preview_cache.clear()
         self.subject_changed.emit()
-    
-    def data_edited(self):
-        self.subject_changed.emit()
+
+    def points_edited(self, hw_test_or_exam, students):
+        self.points_changed.emit(hw_test_or_exam, students)
+        self.students_changed.emit(students)
+
+    def files_edited(self, hw_test_or_exam, students):
+        self.files_changed.emit(hw_test_or_exam, students)
+        self.students_changed.emit(students)
 
     def quit(self):
         self.data_layer.close()
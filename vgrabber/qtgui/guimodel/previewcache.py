@@ -0,0 +1,48 @@
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+
+class PreviewCache:
+    max_size: int
+    hits: int
+    misses: int
+
+    def __init__(self, max_size=16 * 1024 * 1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.__size = 0
+        self.__entries = OrderedDict()
+
+    @property
+    def size(self):
+        return self.__size
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, key: Hashable, render: Callable[[], str]) -> str:
+        if key in self.__entries:
+            self.hits += 1
+            self.__entries.move_to_end(key)
+            return self.__entries[key]
+
+        self.misses += 1
+        ret = render()
+
+        # the size is counted in characters, a preview larger than the whole cache is not kept
+        if len(ret) <= self.max_size:
+            self.__entries[key] = ret
+            self.__size += len(ret)
+            self.__evict()
+
+        return ret
+
+    def clear(self):
+        self.__entries.clear()
+        self.__size = 0
+
+    def __evict(self):
+        while self.__size > self.max_size:
+            key, value = self.__entries.popitem(last=False)
+            self.__size -= len(value)
@@ -4,11 +4,12 @@ from traceback import format_exc, print_exc
 from typing import List
 
 from PyQt5.QtCore import Qt, QSettings
-from PyQt5.QtWidgets import QMainWindow, QMenuBar, QTabWidget, QApplication, QFileDialog, QMessageBox
+from PyQt5.QtWidgets import QMainWindow, QMenuBar, QTabWidget, QApplication, QFileDialog, QMessageBox, \
+    QProgressDialog
 
 from vgrabber.base.importaction import ImportAction
 from vgrabber.base.exportaction import ExportAction
-from vgrabber.datalayer.fileaccessors import DirectoryFileAccessor, ZipFileAccessor
+from vgrabber.datalayer.fileaccessors import DirectoryFileAccessor, ZipFileAccessor, SqliteFileAccessor
 from .tabs import StudentsTab, TeachersTab, HomeWorksTab, TestsTab, FinalExamsTab
 
 try:
@@ -47,6 +48,8 @@ class MainWindow:
         self.__save_action.triggered.connect(self.__save_clicked)
         self.__save_as_action = file_menu.addAction("Save as...")
         self.__save_as_action.triggered.connect(self.__save_as_clicked)
+        self.__compact_action = file_menu.addAction("Compact")
+        self.__compact_action.triggered.connect(self.__compact_clicked)
         self.__close_action = file_menu.addAction("Close")
         self.__close_action.triggered.connect(self.__close_clicked)
         file_menu.addSeparator()
@@ -98,6 +101,7 @@ class MainWindow:
     
         self.__save_action.setEnabled(has_model and self.model.data_layer.can_save)
         self.__save_as_action.setEnabled(has_model)
+        self.__compact_action.setEnabled(has_model and self.model.data_layer.can_save)
         self.__close_action.setEnabled(has_model)
     
         self.__import_action.setEnabled(ALLOW_SYNC)
@@ -146,13 +150,16 @@ class MainWindow:
         file_name, filter = QFileDialog.getOpenFileName(
             self.__window,
             caption="Open Data",
-            filter="Imported data (subjectinfo.xml);;Zipped imported data (*.zip)"
+            filter="Imported data (subjectinfo.xml);;Zipped imported data (*.zip);;SQLite database (*.sqlite)"
         )
 
         if file_name:
             if 'zip' in filter:
                 accessor = ZipFileAccessor(file_name)
                 self.__add_current_file(file_name)
+            elif 'sqlite' in filter:
+                accessor = SqliteFileAccessor(file_name)
+                self.__add_current_file(file_name)
             else:
                 dir_name = dirname(file_name)
                 accessor = DirectoryFileAccessor(dir_name)
@@ -177,18 +184,46 @@ class MainWindow:
         file_name, filter = QFileDialog.getSaveFileName(
             self.__window,
             caption="Save Data",
-            filter="Imported data (subjectinfo.xml);;Zipped imported data (*.zip)"
+            filter="Imported data (subjectinfo.xml);;Zipped imported data (*.zip);;SQLite database (*.sqlite)"
         )
 
         if file_name:
             if 'zip' in filter:
                 accessor = ZipFileAccessor(file_name)
                 self.__add_current_file(file_name)
+            elif 'sqlite' in filter:
+                if '.' not in basename(file_name):
+                    file_name = file_name + '.sqlite'
+                accessor = SqliteFileAccessor(file_name)
+                self.__add_current_file(file_name)
             else:
                 dir_name = dirname(file_name)
                 self.__add_current_file(dir_name)
                 accessor = DirectoryFileAccessor(dir_name)
-            self.model.save_as(accessor)
+
+            progress_dialog = QProgressDialog("Saving files...", None, 0, 0, self.__window)
+            progress_dialog.setWindowModality(Qt.WindowModal)
+            progress_dialog.setMinimumDuration(500)
+
+            def progress(done, total):
+                progress_dialog.setMaximum(total)
+                progress_dialog.setValue(done)
+                QApplication.processEvents()
+
+            try:
+                self.model.save_as(accessor, progress)
+            finally:
+                progress_dialog.reset()
+
+    def __compact_clicked(self, *args):
+        reclaimed = self.model.compact()
+
+        message_box = QMessageBox(self.__window)
+        message_box.setWindowModality(Qt.WindowModal)
+        message_box.setIcon(QMessageBox.Information)
+        message_box.setWindowTitle("Compact")
+        message_box.setText("{0} bytes reclaimed".format(reclaimed))
+        message_box.exec()
 
     def __close_clicked(self, *args):
         self.model.use_subject(None)
@@ -242,6 +277,8 @@ class MainWindow:
         def open():
             if isdir(file):
                 accessor = DirectoryFileAccessor(file)
+            elif file.endswith('.sqlite'):
+                accessor = SqliteFileAccessor(file)
             else:
                 accessor = ZipFileAccessor(file)
             self.model.load(accessor)
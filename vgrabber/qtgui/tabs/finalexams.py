@@ -3,10 +3,11 @@ from PyQt5.QtWidgets import QTreeWidget, QSplitter
 
 from vgrabber.model import FinalExam
 from vgrabber.qtgui.tabs.widgets.filedetails import FileDetailsWidget
-from .helpers.childfileitems import add_file_items, file_double_clicked
+from .helpers.childfileitems import file_double_clicked
 from .helpers.stringify import points_or_none, grade_or_none
+from .helpers.submissionitems import SubmissionItems
 from ..guimodel import GuiModel
-from .items import FinalExamItem, StudentItem
+from .items import FinalExamItem
 
 
 class FinalExamsTab:
@@ -39,16 +40,26 @@ class FinalExamsTab:
         self.widget.setStretchFactor(1, 1)
 
         self.model = model
+        self.__submissions = SubmissionItems(
+            self.__final_exam_details,
+            lambda grade: [points_or_none(grade.points), grade_or_none(grade.grade)]
+        )
         self.__load_final_exam()
 
         self.model.subject_changed.connect(self.__subject_changed)
+        self.model.points_changed.connect(self.__submissions_changed)
+        self.model.files_changed.connect(self.__submissions_changed)
 
     def __subject_changed(self):
         self.__load_final_exam()
 
+    def __submissions_changed(self, hw_test_or_exam, students):
+        if self.__submissions.update(hw_test_or_exam, students):
+            self.__final_exam_file_selected()
+
     def __load_final_exam(self):
         self.__final_exam_list.clear()
-        self.__final_exam_details.clear()
+        self.__submissions.clear()
 
         if self.model.subject is not None:
             for final_exam in self.model.subject.final_exams:
@@ -64,26 +75,12 @@ class FinalExamsTab:
                 self.__final_exam_list.addTopLevelItem(final_exam_item)
 
     def __final_exam_selected(self):
-        self.__final_exam_details.clear()
-
         final_exam_items = self.__final_exam_list.selectedItems()
         if final_exam_items:
             final_exam: FinalExam = final_exam_items[0].final_exam
-
-            for grade in final_exam.get_submissions():
-                student_item = StudentItem(
-                    [
-                        f"{grade.student.surname} {grade.student.name}",
-                        points_or_none(grade.points),
-                        grade_or_none(grade.grade)
-                    ],
-                    grade.student
-                )
-
-                self.__final_exam_details.addTopLevelItem(student_item)
-                add_file_items(grade.files, student_item)
-
-            self.__final_exam_details.expandAll()
+            self.__submissions.show(final_exam)
+        else:
+            self.__submissions.clear()
 
     def __final_exam_file_selected(self):
         self.__final_exam_file_details.master_selection_changed(
@@ -18,5 +18,5 @@ def add_file_items(files, parent_item: QTreeWidgetItem):
 
 def file_double_clicked(model, item):
     if isinstance(item, FileItem) and isinstance(item.file, (StoredFile, ExternalFile)):
-        file_path = model.data_layer.open_file_for_external_app(item.file.file_path)
+        file_path = model.data_layer.open_file_for_external_app(item.file.file_path, item.file.file_name)
         QDesktopServices.openUrl(QUrl.fromLocalFile(file_path))
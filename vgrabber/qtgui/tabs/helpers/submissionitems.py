@@ -0,0 +1,64 @@
+from typing import Callable, List
+
+from PyQt5.QtWidgets import QTreeWidget
+
+from .childfileitems import add_file_items
+from ..items import StudentItem
+
+
+class SubmissionItems:
+    def __init__(self, details: QTreeWidget, get_columns: Callable[[object], List[str]]):
+        self.__details = details
+        self.__get_columns = get_columns
+        self.__hw_test_or_exam = None
+        self.__items = {}
+
+    def clear(self):
+        self.__details.clear()
+        self.__hw_test_or_exam = None
+        self.__items = {}
+
+    def show(self, hw_test_or_exam):
+        self.clear()
+        self.__hw_test_or_exam = hw_test_or_exam
+
+        for record in hw_test_or_exam.get_submissions():
+            self.__add_item(record)
+
+        self.__details.expandAll()
+
+    def update(self, hw_test_or_exam, students):
+        if hw_test_or_exam is not self.__hw_test_or_exam:
+            return False
+
+        for student in students:
+            record = student.get_points_for(hw_test_or_exam)
+            if record is None:
+                continue
+
+            student_item = self.__items.get(record)
+            if student_item is None:
+                student_item = self.__add_item(record)
+            else:
+                for column, text in enumerate(self.__get_columns(record), 1):
+                    student_item.setText(column, text)
+                student_item.takeChildren()
+                add_file_items(record.files, student_item)
+            student_item.setExpanded(True)
+
+        return True
+
+    def __add_item(self, record):
+        student_item = StudentItem(
+            [
+                f"{record.student.surname} {record.student.name}",
+                *self.__get_columns(record)
+            ],
+            record.student
+        )
+
+        self.__details.addTopLevelItem(student_item)
+        add_file_items(record.files, student_item)
+        # a student may have more records of the same item, edits always go to the first one
+        self.__items.setdefault(record, student_item)
+        return student_item
@@ -4,10 +4,11 @@ from PyQt5.QtWidgets import QTreeWidget, QSplitter, QTreeWidgetItem, QMenu
 from vgrabber.model import HomeWork
 from vgrabber.qtgui.dialogs.editfiles import EditFilesDialog
 from .widgets.filedetails import FileDetailsWidget
-from .helpers.childfileitems import add_file_items, file_double_clicked
+from .helpers.childfileitems import file_double_clicked
 from .helpers.stringify import points_or_none
+from .helpers.submissionitems import SubmissionItems
 from ..guimodel import GuiModel
-from .items import HomeWorkItem, StudentItem
+from .items import HomeWorkItem
 from ..dialogs.editpoints import EditPointsDialog
 
 
@@ -42,16 +43,26 @@ class HomeWorksTab:
         self.widget.setStretchFactor(1, 1)
 
         self.model = model
+        self.__submissions = SubmissionItems(
+            self.__home_work_details,
+            lambda home_work_points: [points_or_none(home_work_points.points)]
+        )
         self.__load_home_works()
 
         self.model.subject_changed.connect(self.__subject_changed)
+        self.model.points_changed.connect(self.__submissions_changed)
+        self.model.files_changed.connect(self.__submissions_changed)
 
     def __subject_changed(self):
         self.__load_home_works()
 
+    def __submissions_changed(self, hw_test_or_exam, students):
+        if self.__submissions.update(hw_test_or_exam, students):
+            self.__home_work_file_selected()
+
     def __load_home_works(self):
         self.__home_work_list.clear()
-        self.__home_work_details.clear()
+        self.__submissions.clear()
         self.__home_work_file_details.master_selection_changed([])
 
         if self.model.subject is not None:
@@ -69,26 +80,14 @@ class HomeWorksTab:
         self.__home_work_list.expandAll()
 
     def __home_work_selected(self):
-        self.__home_work_details.clear()
         self.__home_work_file_details.master_selection_changed([])
 
         home_work_items = self.__home_work_list.selectedItems()
         if home_work_items and isinstance(home_work_items[0], HomeWorkItem):
             home_work: HomeWork = home_work_items[0].home_work
-
-            for home_work_points in home_work.get_submissions():
-                student_item = StudentItem(
-                    [
-                        f"{home_work_points.student.surname} {home_work_points.student.name}",
-                        points_or_none(home_work_points.points)
-                    ],
-                    home_work_points.student
-                )
-
-                self.__home_work_details.addTopLevelItem(student_item)
-                add_file_items(home_work_points.files, student_item)
-
-            self.__home_work_details.expandAll()
+            self.__submissions.show(home_work)
+        else:
+            self.__submissions.clear()
 
     def __home_work_file_selected(self):
         self.__home_work_file_details.master_selection_changed(
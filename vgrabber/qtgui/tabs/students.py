@@ -46,9 +46,11 @@ class StudentsTab:
         self.widget.setStretchFactor(1, 1)
 
         self.model = model
+        self.__student_items = {}
         self.__load_students()
 
         self.model.subject_changed.connect(self.__subject_changed)
+        self.model.students_changed.connect(self.__students_changed)
     
     @property
     def headers(self):
@@ -65,11 +67,26 @@ class StudentsTab:
     def __subject_changed(self):
         self.__load_students()
 
+    def __students_changed(self, students):
+        # a changed text in the sort column would move the row right away, the list is sorted once at the end
+        self.__student_list.setSortingEnabled(False)
+        shown_students = [student for student in students if student in self.__student_items]
+        for student, grading in self.model.subject.get_semestral_gradings(shown_students).items():
+            self.__set_semestral_grading(self.__student_items[student], grading)
+        self.__student_list.setSortingEnabled(True)
+
+        student_items = self.__student_list.selectedItems()
+        if student_items and student_items[0].student in students:
+            self.__student_selected()
+
     def __load_students(self):
         self.__student_list.clear()
         self.__student_details.clear()
+        self.__student_items = {}
 
         if self.model.subject is not None:
+            semestral_gradings = self.model.subject.get_semestral_gradings()
+
             for student in self.model.subject.students:
                 moodle_group = student.get_moodle_group()
                 moodle_group_name = ""
@@ -82,12 +99,29 @@ class StudentsTab:
                         f"{student.surname} {student.name}",
                         student.group,
                         student.moodle_email,
-                        moodle_group_name,
-                        str(student.compute_semestral_grading())
+                        moodle_group_name
                     ],
                     student
                 )
+                self.__set_semestral_grading(item, semestral_gradings[student])
                 self.__student_list.addTopLevelItem(item)
+                self.__student_items[student] = item
+
+    def __set_semestral_grading(self, item, grading):
+        item.setText(5, str(grading.points))
+        item.setToolTip(5, self.__describe_semestral_grading(grading))
+
+    def __describe_semestral_grading(self, grading):
+        ret = [f"Tests: {grading.test_points}"]
+        for category, points in grading.category_points.items():
+            ret.append(f"{category.name}: {points}")
+
+        if grading.failed_home_work is not None:
+            ret.append(f"Required points not reached in {grading.failed_home_work.name}")
+        elif grading.total_points < grading.minimum_points:
+            ret.append(f"Less than {grading.minimum_points} points in total")
+
+        return "\n".join(ret)
 
     def __student_selected(self):
         self.__student_details.clear()
@@ -4,9 +4,10 @@ from PyQt5.QtWidgets import QTreeWidget, QSplitter
 from vgrabber.model import Test
 from vgrabber.qtgui.tabs.widgets.filedetails import FileDetailsWidget
 from ..guimodel import GuiModel
-from .helpers.childfileitems import add_file_items, file_double_clicked
+from .helpers.childfileitems import file_double_clicked
 from .helpers.stringify import points_or_none
-from .items import StudentItem, TestItem
+from .helpers.submissionitems import SubmissionItems
+from .items import TestItem
 
 
 class TestsTab:
@@ -38,16 +39,26 @@ class TestsTab:
         self.widget.setStretchFactor(1, 1)
 
         self.model = model
+        self.__submissions = SubmissionItems(
+            self.__test_details,
+            lambda test_points: [points_or_none(test_points.points)]
+        )
         self.__load_tests()
 
         self.model.subject_changed.connect(self.__subject_changed)
+        self.model.points_changed.connect(self.__submissions_changed)
+        self.model.files_changed.connect(self.__submissions_changed)
 
     def __subject_changed(self):
         self.__load_tests()
 
+    def __submissions_changed(self, hw_test_or_exam, students):
+        if self.__submissions.update(hw_test_or_exam, students):
+            self.__test_file_selected()
+
     def __load_tests(self):
         self.__test_list.clear()
-        self.__test_details.clear()
+        self.__submissions.clear()
 
         if self.model.subject is not None:
             for test in self.model.subject.tests:
@@ -58,25 +69,12 @@ class TestsTab:
                 self.__test_list.addTopLevelItem(test_item)
 
     def __test_selected(self):
-        self.__test_details.clear()
-
         home_work_items = self.__test_list.selectedItems()
         if home_work_items:
             test: Test = home_work_items[0].test
-
-            for test_points in test.get_submissions():
-                student_item = StudentItem(
-                    [
-                        f"{test_points.student.surname} {test_points.student.name}",
-                        points_or_none(test_points.points)
-                    ],
-                    test_points.student
-                )
-
-                self.__test_details.addTopLevelItem(student_item)
-                add_file_items(test_points.files, student_item)
-
-            self.__test_details.expandAll()
+            self.__submissions.show(test)
+        else:
+            self.__submissions.clear()
 
     def __test_file_selected(self):
         self.__test_file_details.master_selection_changed(
@@ -1,9 +1,11 @@
+import codecs
+import os
 import zipfile
 from io import BytesIO
 
 from PyQt5.QtWidgets import QTextEdit
 
-from vgrabber.model.files import InMemoryFile, StoredFile, ExternalFile
+from vgrabber.model.files import SpooledFile, StoredFile, ExternalFile
 from vgrabber.qtgui.guimodel import GuiModel
 from vgrabber.qtgui.tabs.items import FileItem
 
@@ -11,6 +13,8 @@ from vgrabber.qtgui.tabs.items import FileItem
 class FileDetailsWidget:
     model: GuiModel
 
+    PREVIEW_SIZE = 64 * 1024
+
     def __init__(self, model):
         super().__init__()
 
@@ -34,17 +38,52 @@ class FileDetailsWidget:
         file = selected_item.file
 
         if file.file_name.endswith('.txt'):
-            self.widget.setText(self.__get_string(file))
+            self.widget.setText(self.__get_preview(file, 'text', self.__format_text))
             self.widget.setVisible(True)
         elif file.file_name.endswith(('.html', '.htm')):
-            self.widget.setHtml(self.__get_string(file))
+            self.widget.setHtml(self.__get_preview(file, 'html', self.__format_html))
             self.widget.setVisible(True)
         elif file.file_name.endswith('.zip'):
-            self.widget.setHtml(self.__format_zip_content(file))
+            self.widget.setHtml(self.__get_preview(file, 'zip', self.__format_zip_content))
             self.widget.setVisible(True)
         else:
             self.widget.setVisible(False)
 
+    def __get_preview(self, file, kind, render):
+        key = self.__get_content_key(file)
+        if key is None:
+            return render(file)
+
+        return self.model.preview_cache.get((kind, key), lambda: render(file))
+
+    def __get_content_key(self, file):
+        # the same content gets the same preview, whichever list or store the file is in
+        if isinstance(file, (SpooledFile, StoredFile)) and file.file_hash is not None:
+            return file.file_hash
+        elif isinstance(file, StoredFile):
+            stats = self.model.data_layer.file_accessor.get_file_stats(file.file_path)
+            if stats is None:
+                return None
+            return file.file_path, stats
+        elif isinstance(file, ExternalFile):
+            try:
+                stat = os.stat(file.file_path)
+            except OSError:
+                return None
+            return file.file_path, stat.st_size, stat.st_mtime
+        else:
+            return None
+
+    def __format_text(self, file):
+        text, truncated = self.__get_string(file)
+        if truncated:
+            text += '\n…'
+        return text
+
+    def __format_html(self, file):
+        text, _ = self.__get_string(file)
+        return text
+
     def __format_zip_content(self, file):
         def format_recursive(cur: dict):
             ret = []
@@ -58,22 +97,42 @@ class FileDetailsWidget:
         return format_recursive(self.__get_zip_content(file))
 
     def __get_zip_content(self, file):
-        with zipfile.ZipFile(BytesIO(self.__get_data(file))) as f:
-            ret = {}
-            for path in f.namelist():
-                cur = ret
-                for component in path.split('/'):
-                    cur = cur.setdefault(component, {})
-            return ret
+        stream = self.__open_file(file)
+        if stream is None:
+            return {}
+
+        with stream:
+            # zipfile only reads the central directory at the end of a seekable stream
+            if not stream.seekable():
+                stream = BytesIO(stream.read())
+
+            with zipfile.ZipFile(stream) as f:
+                ret = {}
+                for path in f.namelist():
+                    cur = ret
+                    for component in path.split('/'):
+                        cur = cur.setdefault(component, {})
+                return ret
 
     def __get_string(self, file):
-        return self.__get_data(file).decode('utf8')
-
-    def __get_data(self, file):
-        if isinstance(file, InMemoryFile):
-            return file.data
-        elif isinstance(file, (StoredFile, ExternalFile)):
-            with self.model.data_layer.file_accessor.open_file(file.file_path, 'r') as f:
-                return f.read()
+        stream = self.__open_file(file)
+        if stream is None:
+            return '', False
+
+        with stream:
+            data = stream.read(self.PREVIEW_SIZE + 1)
+
+        truncated = len(data) > self.PREVIEW_SIZE
+        # a character cut in half by the preview limit is left out instead of failing the whole preview
+        decoder = codecs.getincrementaldecoder('utf8')('replace')
+        return decoder.decode(data[:self.PREVIEW_SIZE], final=not truncated), truncated
+
+    def __open_file(self, file):
+        if isinstance(file, SpooledFile):
+            return file.open()
+        elif isinstance(file, StoredFile):
+            return self.model.data_layer.file_accessor.open_file(file.file_path, 'r')
+        elif isinstance(file, ExternalFile):
+            return open(file.file_path, 'rb')
         else:
-            return b''
+            return None
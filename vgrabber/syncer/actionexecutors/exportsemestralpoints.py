@@ -21,12 +21,13 @@ class ExportSemestralPointsActionExecutor(ActionExecutor):
         tag.click()
         
         has_changes = False
+        semestral_gradings = model.get_semestral_gradings()
         
         for student in model.students:
             point_inputs = browser.find_elements_by_xpath(
                 '//table[@class="data"]//tr[.//td/text()="{0}"]//td[4]//input'.format(student.number))
             
-            points = student.compute_semestral_grading()
+            points = semestral_gradings[student].points
             if abs(points - int(points)) < 0.1:
                 points = int(points)
             
@@ -4,13 +4,15 @@ import lxml.html
 
 from seleniumrequests import Chrome
 
-from vgrabber.model.files import InMemoryFile
+from vgrabber.model.files import SpooledFile
 from vgrabber.base.importaction import ImportAction
 from vgrabber.model import Subject
 from .actionexecutor import ActionExecutor
 
 
 class FileDownloaderActionExecutor(ActionExecutor):
+    __CHUNK_SIZE = 1024 * 1024
+
     __html_envelope = '''
     <html>
         <head>
@@ -65,9 +67,11 @@ class FileDownloaderActionExecutor(ActionExecutor):
                 email_element = file_link.find_element_by_xpath('./ancestor::tr//td[contains(@class, "email")]')
                 student = model.get_student_by_email(email_element.text)
                 file_href = file_link.get_attribute('href')
-                file_content = browser.request('GET', file_href).content
 
-                yield student, InMemoryFile(file_link.text, file_content)
+                with browser.request('GET', file_href, stream=True) as response:
+                    assignment_file = SpooledFile(file_link.text, response.iter_content(self.__CHUNK_SIZE))
+
+                yield student, assignment_file
 
             all_online_text_links = browser.find_elements_by_xpath(
                 '//a[contains(@href, "plugin=onlinetext")][following-sibling::div[@class="no-overflow"]]'
@@ -86,7 +90,7 @@ class FileDownloaderActionExecutor(ActionExecutor):
                     html_element.append(body_element)
                     body_element.append(online_text_element[0])
                     serialized_text = lxml.html.tostring(html_element)
-                    yield student, InMemoryFile('onlinetext.html', serialized_text)
+                    yield student, SpooledFile('onlinetext.html', serialized_text)
 
             if not any(browser.find_elements_by_link_text("Ďalší")):
                 break
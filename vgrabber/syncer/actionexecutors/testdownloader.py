@@ -5,7 +5,7 @@ import lxml.html
 from seleniumrequests import Chrome
 
 from vgrabber.model import Subject
-from vgrabber.model.files import InMemoryFile
+from vgrabber.model.files import SpooledFile
 from .actionexecutor import ActionExecutor
 
 
@@ -145,7 +145,7 @@ class TestDownloaderActionExecutor(ActionExecutor):
                     body_element.append(review_element[0])
                     serialized_text = lxml.html.tostring(html_element)
 
-                    student.add_test_file(test, InMemoryFile('test.html', serialized_text))
+                    student.add_test_file(test, SpooledFile('test.html', serialized_text))
 
                 if not any(browser.find_elements_by_link_text("Ďalší")):
                     break
@@ -36,3 +36,10 @@ class Importer(Syncer):
         ({ImportAction.moodle_test_details}, TestDownloaderActionExecutor),
         ({ImportAction.moodle_teacher_groups}, MoodleTeacherGroupsActionExecutor),
     )
+
+    def exec(self):
+        super().exec()
+
+        if self.model is not None:
+            # import executors assign model attributes directly, so changes cannot be tracked in detail
+            self.model.mark_changed()
@@ -0,0 +1,41 @@
+import os
+import shutil
+from typing import BinaryIO
+
+__CHUNK_SIZE = 1024 * 1024 * 1024
+
+
+def __copy_file_range(source, target):
+    while os.copy_file_range(source, target, __CHUNK_SIZE):
+        pass
+
+
+def __sendfile(source, target):
+    offset = 0
+    while True:
+        sent = os.sendfile(target, source, offset, __CHUNK_SIZE)
+        if not sent:
+            break
+        offset += sent
+
+
+# the kernel copies the data itself where it can, each one is tried in turn before reading the file in python
+__kernel_copies = [
+    kernel_copy
+        for name, kernel_copy in (('copy_file_range', __copy_file_range), ('sendfile', __sendfile))
+            if hasattr(os, name)
+]
+
+
+def copy_file(source_path, target: BinaryIO):
+    with open(source_path, 'rb') as source:
+        for kernel_copy in __kernel_copies:
+            try:
+                kernel_copy(source.fileno(), target.fileno())
+                return
+            except OSError:
+                source.seek(0)
+                target.seek(0)
+                target.truncate()
+
+        shutil.copyfileobj(source, target)
@@ -0,0 +1,5 @@
+def format_number(number):
+    # the model keeps numbers as floats, a whole one is written as typed, 25 and not 25.0
+    if isinstance(number, float) and number.is_integer():
+        return str(int(number))
+    return str(number)